@@ -0,0 +1,73 @@
+# migrate_content.py
+#
+# One-time backfill of the fields add_content now writes: derived search
+# fields (tags_norm, search_tokens, degree_codes), typed rating /
+# downloads and created_at, plus the indexes behind them. Safe to re-run.
+
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from services.connectDB import connect_db
+from services.content_fields import content_search_fields, typed_content_fields, ensure_content_indexes
+
+COLLECTION_NAME = "Content"
+
+
+def legacy_created_at(docs):
+    """
+    {_id: created_at} for documents without one. ObjectIds carry their
+    insert time; the seeded numeric-string ids ("1", "2", ...) get times
+    just before the oldest of those, one second apart in id order.
+    """
+    created = {}
+    legacy = []
+    for doc in docs:
+        if doc.get("created_at") is not None:
+            continue
+        if isinstance(doc["_id"], ObjectId):
+            created[doc["_id"]] = doc["_id"].generation_time.replace(tzinfo=None)
+        else:
+            legacy.append(doc["_id"])
+
+    known = [d["created_at"] for d in docs if d.get("created_at") is not None] + list(created.values())
+    start = min(known, default=datetime.utcnow()) - timedelta(seconds=len(legacy))
+    legacy.sort(key=lambda i: (0, int(i), "") if str(i).isdigit() else (1, 0, str(i)))
+    for n, doc_id in enumerate(legacy):
+        created[doc_id] = start + timedelta(seconds=n)
+    return created
+
+
+def migrate_content():
+    db = connect_db()
+    if db is None:
+        print("Cannot proceed without DB connection")
+        return
+
+    collection = db[COLLECTION_NAME]
+
+    docs = list(collection.find({}, {"title": 1, "tags": 1, "rating": 1, "downloads": 1, "created_at": 1}))
+    created = legacy_created_at(docs)
+
+    ops = []
+    unparsed = []
+    for doc in docs:
+        fields = content_search_fields(doc)
+        typed, bad_fields = typed_content_fields(doc)
+        fields.update(typed)
+        if doc["_id"] in created:
+            fields["created_at"] = created[doc["_id"]]
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        # Left as stored; fix these by hand
+        unparsed.extend((doc["_id"], key, doc[key]) for key in bad_fields)
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    ensure_content_indexes(collection)
+
+    print(f"Migrated {len(ops)} content documents")
+    for doc_id, key, value in unparsed:
+        print(f"⚠️ Content {doc_id}: left {key}={value!r} unchanged (not a number)")
+
+
+if __name__ == "__main__":
+    migrate_content()
@@ -0,0 +1,52 @@
+# migrate_timeline.py
+#
+# Splits the single "timeline" document into one document per exam in
+# "timeline_exams", with canonical degree codes and parsed event date
+# ranges, and creates the indexes behind /timeline and /timeline/upcoming.
+# Safe to re-run: the collection is rebuilt from the source each time.
+#
+#   python migrate_timeline.py                  → from the "timeline" document in Mongo
+#   python migrate_timeline.py data/time.json   → from a JSON file
+
+import json
+import sys
+from services.connectDB import connect_db
+from services.timeline_exams import (
+    TIMELINE_EXAMS_COLLECTION,
+    LEGACY_EXAMS_KEY,
+    exam_document,
+    ensure_timeline_indexes,
+)
+
+
+def migrate_timeline(json_path=None):
+    db = connect_db()
+    if db is None:
+        print("Cannot proceed without DB connection")
+        return
+
+    if json_path:
+        with open(json_path, "r", encoding="utf-8") as f:
+            source = json.load(f)
+    else:
+        source = db.timeline.find_one()
+
+    if not source:
+        print("No timeline data found")
+        return
+
+    exams = source.get(LEGACY_EXAMS_KEY, []) if isinstance(source, dict) else source
+    docs = [exam_document(exam, order) for order, exam in enumerate(exams)]
+
+    collection = db[TIMELINE_EXAMS_COLLECTION]
+    collection.delete_many({})
+    if docs:
+        collection.insert_many(docs)
+    ensure_timeline_indexes(collection)
+
+    unparsed = sum(1 for d in docs for e in d["events"] if e["start"] is None)
+    print(f"Migrated {len(docs)} exams into '{TIMELINE_EXAMS_COLLECTION}' ({unparsed} events without a parseable date)")
+
+
+if __name__ == "__main__":
+    migrate_timeline(sys.argv[1] if len(sys.argv) > 1 else None)
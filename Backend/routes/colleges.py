@@ -4,136 +4,86 @@
 
 from flask import Blueprint, request, jsonify
 from services.connectDB import connect_db
-from bson import ObjectId
 from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from services.college_catalog import (
+    CATALOG_TTL_SECONDS,
+    get_catalog,
+    refresh_catalog,
+    record_interest,
+    resolve_college_fields,
+    project_college,
+    serialize_college,
+)
+from services.college_fields import (
+    parse_rating,
+    parse_reviews_count,
+    parse_nirf_rank,
+    parse_interest,
+    materialize_sort_fields,
+    rematerialize,
+    SORT_SOURCE_FIELDS,
+    UNRANKED_NIRF,
+    college_oid,
+)
+from services.interest_buffer import interest_buffer
+from services.recommendation_cache import recommendation_cache, recommendation_fingerprint
+from services.lru_cache import LRUCache
+from services.degree_taxonomy import canonical_degree, degree_code, tag_course_codes
+from services.ndjson import wants_ndjson, parse_batch_size, ndjson_response
+from services.pagination import (
+    parse_page_args,
+    fetch_page,
+    encode_cursor,
+    decode_cursor,
+    InvalidCursor,
+)
 import json
-import re  # For fuzzy matching if needed
+import os
+import re
+import time
+import numpy as np
 
 college_routes = Blueprint("college_routes", __name__)
 
 
-def serialize_college(doc):
-    doc["_id"] = str(doc["_id"])
-    # Ensure interest is always present
-    doc["interest"] = int(doc.get("interest", 0))
-    return doc
-
-
-# Degree to short_name mapping (expand as needed based on quiz degrees)
-DEGREE_TO_SHORTNAME = {
-    "B.Tech": "BTECH",
-    "B.Arch": "BARCH",
-    "BBA": "BBA",
-    "MBA": "MBA",
-    "B.Com": "BCOM",
-    "B.Sc": "BSC",
-    "BCA": "BCA",
-    "B.Des": "BDES",
-    "BA": "BA",
-    "B.Pharm": "BPHARM",
-    # Add more mappings as per quiz outputs
-}
-
-
 def get_short_name_from_degree(degree_name):
-    """Map degree name to short_name. Use fuzzy if exact not found."""
-    short_name = DEGREE_TO_SHORTNAME.get(degree_name)
-    if short_name:
-        return short_name.upper()
-    
-    # Fuzzy fallback: e.g., "B.Tech in Civil" -> "BTECH"
-    degree_upper = degree_name.upper()
-    if "B.TECH" in degree_upper:
-        return "BTECH"
-    if "B.ARCH" in degree_upper:
-        return "BARCH"
-    if "BBA" in degree_upper:
-        return "BBA"
-    if "MBA" in degree_upper:
-        return "MBA"
-    if "B.COM" in degree_upper or "BCOM" in degree_upper:
-        return "BCOM"
-    if "B.SC" in degree_upper:
-        return "BSC"
-    if "BCA" in degree_upper:
-        return "BCA"
-    if "B.DES" in degree_upper:
-        return "BDES"
-    if "BA" in degree_upper:
-        return "BA"
-    if "B.PHARM" in degree_upper:
-        return "BPHARM"
-    return None
-
-
-def matches_specialization(quiz_specs, course_specs):
-    """Check if any quiz specialization matches any course specialization (case-insensitive partial match)."""
-    if not quiz_specs or not course_specs:
-        return True  # If no specs, consider match
-    quiz_specs = [s.lower() for s in quiz_specs]
-    course_specs = [s.lower() for s in course_specs if s]  # Filter None/empty
-    for q_spec in quiz_specs:
-        if any(q_spec in c_spec for c_spec in course_specs):
-            return True
-    return False
-
-
-def parse_rating(val):
-    """Parse rating to float, handling strings like '4.5' or null/None."""
-    if val is None:
-        return 0.0
-    if isinstance(val, (int, float)):
-        return float(val)
-    if isinstance(val, str):
-        # Extract numeric part, e.g., "4.5" or "4.5/5"
-        match = re.search(r'(\d+(?:\.\d+)?)', val)
-        return float(match.group(1)) if match else 0.0
-    return 0.0
-
-
-def parse_reviews_count(val):
-    """Parse reviews_count to int, handling strings like '38 Student Reviews' or '5 reviews' or null/None."""
-    if val is None:
-        return 0
-    if isinstance(val, int):
-        return val
-    if isinstance(val, str):
-        # Extract numeric part, e.g., "38 Student Reviews" → 38
-        match = re.search(r'(\d+)', val)
-        return int(match.group(1)) if match else 0
-    return 0
-
-
-def parse_nirf_rank(val):
-    """Parse nirf_rank to int or None."""
-    if val is None:
-        return None
-    if isinstance(val, int):
-        return val
-    if isinstance(val, str):
-        match = re.search(r'\d+', val)
-        return int(match.group()) if match else None
-    return None
+    """Map a quiz degree name ("B.Tech in Civil") to its canonical short_name."""
+    return canonical_degree(degree_name)
 
 
 # -----------------------------------
 # GET /api/colleges  -> list colleges
+# ?view=card|full or ?fields=name,district,... to trim each document
+# ?stream=1 (or Accept: application/x-ndjson) exports one college per line
+# straight from a Mongo cursor; ?batch_size= sets the cursor batch size
 # -----------------------------------
 @college_routes.route("/colleges", methods=["GET"])
 def get_colleges():
-    db = connect_db()
-    colleges_cursor = db.College.find()
-
-    colleges = [serialize_college(c) for c in colleges_cursor]
-
-    # total interest to help frontend compute %
-    total_interest = sum(c["interest"] for c in colleges)
+    try:
+        fields = resolve_college_fields(request.args.get("view"), request.args.get("fields"))
+        batch_size = parse_batch_size(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    if wants_ndjson(request):
+        db = connect_db()
+        projection = None if fields is None else {field: 1 for field in fields}
+        cursor = db.College.find({}, projection).batch_size(batch_size)
+        return ndjson_response(cursor, lambda doc: project_college(serialize_college(doc), fields))
+
+    catalog = get_catalog()
+    if fields is None:
+        colleges = catalog.colleges
+    else:
+        colleges = [project_college(c, fields) for c in catalog.colleges]
 
     return jsonify({
         "success": True,
         "data": colleges,
-        "totalInterest": total_interest,
-        "total": len(colleges)
+        # total interest to help frontend compute %
+        "totalInterest": catalog.total_interest,
+        "total": len(catalog.colleges)
     }), 200
 
 
@@ -146,9 +96,13 @@ def add_college():
     data = request.json or {}
 
     # default interest = 0
-    data.setdefault("interest", 0)
+    data["interest"] = parse_interest(data.get("interest"))
+    data.update(materialize_sort_fields(data))
+    if isinstance(data.get("courses"), list):
+        tag_course_codes(data["courses"])
 
     result = db.College.insert_one(data)
+    refresh_catalog()
 
     return jsonify({
         "success": True,
@@ -163,65 +117,133 @@ def add_college():
 # -------------------------------------------------
 @college_routes.route("/colleges/interest-batch", methods=["POST"])
 def interest_batch():
-    db = connect_db()
-
     # Read raw body (works for sendBeacon + fetch + axios)
     raw_data = request.get_data(as_text=True)
-    print("🔥 RAW interest-batch BODY:", raw_data)
 
     payload = {}
     if raw_data:
         try:
             payload = json.loads(raw_data)
-        except Exception as e:
-            print("⚠ Failed to parse JSON from raw_data:", e)
+        except Exception:
             # fallback: try normal get_json
             payload = request.get_json(silent=True) or {}
     else:
         payload = request.get_json(silent=True) or {}
 
     interest_map = payload.get("interest", {})
-    print("🧩 Parsed interest_map:", interest_map)
 
     if not isinstance(interest_map, dict) or not interest_map:
         return jsonify({"success": False, "message": "No interest data"}), 400
 
-    updated_ids = []
-
+    increments = {}
     for college_id, inc in interest_map.items():
         try:
             inc = int(inc)
-            if inc <= 0:
-                continue
-
-            # Try ObjectId, fallback to string ID
-            try:
-                oid = ObjectId(college_id)
-                filter_query = {"_id": oid}
-            except Exception:
-                filter_query = {"_id": college_id}
-
-            result = db.College.update_one(
-                filter_query, {"$inc": {"interest": inc}})
-
-            if result.modified_count > 0:
-                updated_ids.append(college_id)
-                print(f"✅ Incremented interest for {college_id} by {inc}")
-            else:
-                print(f"⚠ No document matched for {college_id}")
-
-        except Exception as e:
-            print("❌ Interest update error:", e)
+        except (TypeError, ValueError):
             continue
+        if inc > 0:
+            increments[str(college_id)] = inc
+
+    # Merged with other requests and flushed in the background
+    # (services/interest_buffer.py); don't wait on Mongo here.
+    record_interest(increments)
 
-    print("📊 Final updated_ids:", updated_ids)
+    return jsonify({"success": True, "queued": list(increments)}), 202
 
-    return jsonify({"success": True, "updated": updated_ids}), 200
+
+# -------------------------------------------------
+# GET /api/colleges/interest-batch/stats
+# Write-behind buffer counters (accepted / flushed / lost / pending)
+# -------------------------------------------------
+@college_routes.route("/colleges/interest-batch/stats", methods=["GET"])
+def interest_batch_stats():
+    return jsonify({"success": True, "data": interest_buffer.snapshot_stats()}), 200
+
+
+# -------------------------------------------------
+# PUT /api/colleges/update-many
+# body: { "updates": [ { "_id": "<collegeId>", "data": { ...fields to $set } }, ... ] }
+# Applied in unordered chunks of UPDATE_CHUNK_SIZE; the response reports
+# matched / modified / error per item.
+# -------------------------------------------------
+UPDATE_CHUNK_SIZE = int(os.getenv("COLLEGE_UPDATE_CHUNK_SIZE", "500"))
+
+
+_MISSING = object()
+
+
+def _field_value(doc, path):
+    """Value at a dotted $set path ("courses.0.short_name" indexes lists), or _MISSING."""
+    for part in path.split("."):
+        if isinstance(doc, list) and part.isdigit():
+            if int(part) >= len(doc):
+                return _MISSING
+            doc = doc[int(part)]
+        elif isinstance(doc, dict) and part in doc:
+            doc = doc[part]
+        else:
+            return _MISSING
+    return doc
+
+
+def _apply_update_chunk(collection, chunk, results):
+    """
+    Run one unordered bulk_write for `chunk` ([(result_index, oid, data)])
+    and fill in results[result_index]. Returns ids whose directory sort
+    fields need recomputing.
+    """
+    ids = [oid for _, oid, _ in chunk]
+    touched = {key.split(".")[0] for _, _, data in chunk for key in data}
+    try:
+        # Current values tell us which items exist and which will change
+        existing = {
+            doc["_id"]: doc
+            for doc in collection.find({"_id": {"$in": ids}}, {field: 1 for field in touched})
+        }
+        ops = [UpdateOne({"_id": oid}, {"$set": data}) for _, oid, data in chunk]
+        errors = {}
+        try:
+            collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err.get("errmsg", "Write error") for err in e.details.get("writeErrors", [])}
+    except Exception as e:
+        for result_index, _, _ in chunk:
+            results[result_index].update({"status": "error", "error": str(e)})
+        return []
+
+    resort_ids = []
+    for op_index, (result_index, oid, data) in enumerate(chunk):
+        result = results[result_index]
+        if op_index in errors:
+            result.update({"status": "error", "error": errors[op_index]})
+        elif oid not in existing:
+            result.update({"status": "not_found", "matched": False, "modified": False})
+        else:
+            doc = existing[oid]
+            modified = any(_field_value(doc, key) != value for key, value in data.items())
+            result.update({"status": "updated", "matched": True, "modified": modified})
+            if modified and any(key.split(".")[0] in SORT_SOURCE_FIELDS for key in data):
+                resort_ids.append(oid)
+    return resort_ids
+
+
+def _with_degree_codes(update_data):
+    """Keep courses[].degree_code in step with edited course short_names."""
+    data = dict(update_data)
+    if isinstance(data.get("courses"), list):
+        data["courses"] = tag_course_codes([dict(c) if isinstance(c, dict) else c for c in data["courses"]])
+    for key, value in update_data.items():
+        # "courses.<n>.short_name" edits one course in place
+        parts = key.split(".")
+        if len(parts) == 3 and parts[0] == "courses" and parts[2] == "short_name":
+            data[f"courses.{parts[1]}.degree_code"] = degree_code(value)
+    return data
 
 
 @college_routes.route("/colleges/update-many", methods=["PUT"])
 def update_many_colleges():
     db = connect_db()
+    started = time.perf_counter()
 
     # Read JSON safely
     payload = request.get_json(silent=True) or {}
@@ -236,44 +258,71 @@ def update_many_colleges():
             "message": "No updates provided"
         }), 200
 
-    bulk_ops = []
-    updated_ids = []
-
+    results = []
+    pending = []
     for item in updates:
-        college_id = item.get("_id")
-        update_data = item.get("data")
+        college_id = item.get("_id") if isinstance(item, dict) else None
+        update_data = item.get("data") if isinstance(item, dict) else None
+        results.append({"_id": college_id})
 
         # Validate each item
-        if not college_id or not isinstance(update_data, dict):
+        if not college_id or not isinstance(update_data, dict) or not update_data:
+            results[-1].update({"status": "invalid", "error": "Expected {_id, data} with a non-empty data object"})
             continue
 
-        # Convert ID to ObjectId if possible
-        try:
-            oid = ObjectId(college_id)
-        except:
-            oid = college_id  # fallback string ID
-
-        # Add bulk update operation
-        bulk_ops.append(
-            UpdateOne(
-                {"_id": oid},
-                {"$set": update_data}
-            )
-        )
-        updated_ids.append(college_id)
-
-    # Run bulk update
-    if len(bulk_ops) > 0:
-        db.College.bulk_write(bulk_ops)
+        pending.append((len(results) - 1, college_oid(str(college_id)), _with_degree_codes(update_data)))
+
+    chunks = 0
+    for start in range(0, len(pending), UPDATE_CHUNK_SIZE):
+        chunk = pending[start:start + UPDATE_CHUNK_SIZE]
+        resort_ids = _apply_update_chunk(db.College, chunk, results)
+        # Keep the stored directory sort fields in step with the edit
+        if resort_ids:
+            rematerialize(db.College, resort_ids)
+        chunks += 1
+
+    updated_ids = [r["_id"] for r in results if r.get("matched")]
+    if updated_ids:
+        refresh_catalog()
 
     return jsonify({
         "success": True,
         "updated": updated_ids,
         "count": len(updated_ids),
+        "matched": len(updated_ids),
+        "modified": sum(1 for r in results if r.get("modified")),
+        "not_found": sum(1 for r in results if r["status"] == "not_found"),
+        "failed": sum(1 for r in results if r["status"] in ("error", "invalid")),
+        "results": results,
+        "chunks": chunks,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
         "message": "Bulk update completed"
     }), 200
 
 
+def _recommended_college(college, course_positions):
+    """Response entry for a recommended college and its matched courses."""
+    college_dict = dict(college)
+    college_dict["matched_courses"] = []
+    for course_pos in sorted(course_positions):
+        course = college["courses"][course_pos]
+        college_dict["matched_courses"].append({
+            "name": course.get("name"),
+            "short_name": course["short_name"].upper(),
+            "specializations": course.get("specializations") or [],
+            "duration": course.get("duration"),
+            "eligibility": course.get("eligibility"),
+            "tuition_fee": course.get("tuition_fee"),
+            "annual_fee": course.get("annual_fee")
+        })
+
+    # Parsed sorting fields, as the frontend expects them
+    college_dict["nirf_rank_parsed"] = parse_nirf_rank(college_dict.get("nirf_rank"))
+    college_dict["rating"] = parse_rating(college_dict.get("rating"))
+    college_dict["reviews_count"] = parse_reviews_count(college_dict.get("reviews_count"))
+    return college_dict
+
+
 # -------------------------------------------------
 # GET /api/colleges/recommend/<user_id>
 # Recommend top 15 colleges: 10 in Nagpur (priority), then 5 outside
@@ -310,345 +359,279 @@ def recommend_colleges(user_id):
     if not all_degrees:
         return jsonify({"success": False, "message": "No matching degrees found"}), 400
     
-    # Find colleges with matching courses
-    nagpur_colleges = []
-    outside_nagpur = []
-    for college in db.College.find():
-        college_dict = serialize_college(dict(college))
-        matched_courses = []
-        
-        for course in college.get("courses", []):
-            # Safely handle short_name
-            short_name_val = course.get("short_name")
-            course_short = (short_name_val or "").upper() if isinstance(short_name_val, str) else ""
-            
-            if course_short in all_degrees:
-                course_specs = course.get("specializations") or []
-                if matches_specialization(all_degrees[course_short], course_specs):
-                    matched_courses.append({
-                        "name": course.get("name"),
-                        "short_name": course_short,
-                        "specializations": course_specs,
-                        "duration": course.get("duration"),
-                        "eligibility": course.get("eligibility"),
-                        "tuition_fee": course.get("tuition_fee"),
-                        "annual_fee": course.get("annual_fee")
-                    })
-        
-        if matched_courses:
-            college_dict["matched_courses"] = matched_courses
-            # Parse sorting fields
-            nirf_rank = parse_nirf_rank(college_dict.get("nirf_rank"))
-            college_dict["nirf_rank_parsed"] = nirf_rank  # For sorting
-            college_dict["rating"] = parse_rating(college_dict.get("rating"))
-            college_dict["reviews_count"] = parse_reviews_count(college_dict.get("reviews_count"))
-            
-            # Split by Nagpur (check district or nirf_city)
-            is_nagpur = (
-                college_dict.get("district", "").lower() == "nagpur" or
-                college_dict.get("nirf_city", "").lower() == "nagpur"
-            )
-            if is_nagpur:
-                nagpur_colleges.append(college_dict)
-            else:
-                outside_nagpur.append(college_dict)
-    
-    # Custom sort key: nirf_rank asc (lower better, None last), then reviews desc, then rating desc
-    def sort_key(c):
-        rank = c["nirf_rank_parsed"] if c["nirf_rank_parsed"] is not None else float('inf')
-        return (rank, -c["reviews_count"], -c["rating"])
-    
-    # Sort both lists
-    nagpur_colleges.sort(key=sort_key)
-    outside_nagpur.sort(key=sort_key)
-    
+    # Same degrees/specs against the same catalog version → same answer
+    catalog = get_catalog()
+    fingerprint = recommendation_fingerprint(all_degrees, catalog.version)
+    cached = recommendation_cache.get(user_id, fingerprint)
+    if cached is not None:
+        return jsonify(cached), 200
+
+    # Find (college, course) postings for each requested degree
+    matched_postings = {}
+    for short_name, specs in all_degrees.items():
+        for college_pos, course_pos in catalog.course_index.lookup(short_name, specs):
+            matched_postings.setdefault(college_pos, []).append(course_pos)
+
+    # Rank on the snapshot's columnar data; only the winners become dicts
+    ranking = catalog.ranking
+    matched = np.fromiter(matched_postings, dtype=np.int64, count=len(matched_postings))
+    in_nagpur = ranking.is_nagpur[matched]
+
     # Top 10 Nagpur + Top 5 outside (or adjust if fewer)
-    top_nagpur = nagpur_colleges[:10]
-    top_outside = outside_nagpur[:5]
+    top_nagpur = [
+        _recommended_college(catalog.colleges[pos], matched_postings[pos])
+        for pos in ranking.top(matched[in_nagpur], 10)
+    ]
+    top_outside = [
+        _recommended_college(catalog.colleges[pos], matched_postings[pos])
+        for pos in ranking.top(matched[~in_nagpur], 5)
+    ]
     top_colleges = top_nagpur + top_outside
     
     if not top_colleges:
-        return jsonify({"success": True, "data": [], "message": "No matching colleges found"}), 200
-    
-    return jsonify({
-        "success": True,
-        "data": top_colleges,
-        "total": len(nagpur_colleges) + len(outside_nagpur),
-        "nagpur_count": len(top_nagpur),
-        "outside_count": len(top_outside),
-        "message": f"Recommended {len(top_colleges)} colleges: {len(top_nagpur)} in Nagpur, {len(top_outside)} outside"
-    }), 200
+        body = {"success": True, "data": [], "message": "No matching colleges found"}
+    else:
+        body = {
+            "success": True,
+            "data": top_colleges,
+            "total": len(matched),
+            "nagpur_count": len(top_nagpur),
+            "outside_count": len(top_outside),
+            "message": f"Recommended {len(top_colleges)} colleges: {len(top_nagpur)} in Nagpur, {len(top_outside)} outside"
+        }
+
+    recommendation_cache.put(user_id, fingerprint, body)
+    return jsonify(body), 200
 
 
-# the college directory with sorting and filtering
 # -------------------------------------------------
 # the college directory with sorting and filtering
 # -------------------------------------------------
 
-@college_routes.route("/colleges/directory", methods=["GET"])
-def college_directory():
-    db = connect_db()
+# Sort/filter fields (is_nagpur, nirf_rank_num, reviews_num, rating_num,
+# has_image) are materialized on each document at write time, see
+# services/college_fields.py, and backed by COLLEGE_INDEXES.
+
+DIRECTORY_FIELDS = {
+    "name": 1,
+    "state": 1,
+    "district": 1,
+    "city": 1,
+    "image_url": 1,
+    "rating": 1,
+    "reviews_count": 1,
+    "nirf_rank": 1,
+    "website": 1,
+    "college_type": 1,
+    "year_established": 1,
+    "interest": 1,
+}
+
 
-    # Only colleges that have a valid image_url
-    base_filter = {
-        "image_url": {"$exists": True, "$ne": None, "$ne": ""}
+def _directory_row(college):
+    """Shape a College document the way the directory frontend expects it."""
+    return {
+        "_id": str(college["_id"]),
+        "name": college.get("name") or "Unknown College",
+        "state": college.get("state"),
+        "district": college.get("district"),
+        "city": college.get("city") or college.get("district") or "Unknown",
+        "image_url": college.get("image_url"),
+        "rating": college.get("rating") if college.get("rating") is not None else "N/A",
+        "reviews_count": college.get("reviews_count") if college.get("reviews_count") is not None else "0",
+        "nirf_rank": college.get("nirf_rank") if college.get("nirf_rank") is not None else "Not Ranked",
+        "website": college.get("website") or "",
+        "college_type": college.get("college_type"),
+        "year_established": college.get("year_established"),
+        "interest": parse_interest(college.get("interest")),
     }
 
-    pipeline = [
-        {"$match": base_filter},
-
-        # Safely compute sorting fields (avoid errors on null/missing fields)
-        {"$addFields": {
-            "is_nagpur": {
-                "$cond": {
-                    "if": {
-                        "$or": [
-                            {"$eq": [{"$toLower": {"$ifNull": ["$district", ""]}}, "nagpur"]},
-                            {"$eq": [{"$toLower": {"$ifNull": ["$nirf_city", ""]}}, "nagpur"]},
-                            {"$regexMatch": {
-                                "input": {"$toLower": {"$ifNull": ["$name", ""]}},
-                                "regex": "nagpur"
-                            }}
-                        ]
-                    },
-                    "then": True,
-                    "else": False
-                }
-            },
-
-            "nirf_rank_num": {
-                "$cond": {
-                    "if": {
-                        "$and": [
-                            {"$ne": ["$nirf_rank", None]},
-                            {"$ne": ["$nirf_rank", ""]},
-                            {"$isNumber": "$nirf_rank"}
-                        ]
-                    },
-                    "then": "$nirf_rank",
-                    "else": {
-                        "$cond": {
-                            "if": {
-                                "$regexMatch": {
-                                    "input": {"$toString": {"$ifNull": ["$nirf_rank", "999999"]}},
-                                    "regex": "^\\d+$"
-                                }
-                            },
-                            "then": {"$toInt": {"$toString": "$nirf_rank"}},
-                            "else": 999999
-                        }
-                    }
-                }
-            },
-
-            "reviews_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$reviews_count"},
-                    "then": "$reviews_count",
-                    "else": {
-                        "$cond": {
-                            "if": {"$ne": ["$reviews_count", None]},
-                            "then": {
-                                "$toInt": {
-                                    "$arrayElemAt": [
-                                        {"$split": [{"$toString": {"$ifNull": ["$reviews_count", "0"]}}, " "]},
-                                        0
-                                    ]
-                                }
-                            },
-                            "else": 0
-                        }
-                    }
-                }
-            },
-
-            "rating_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$rating"},
-                    "then": {"$toDouble": "$rating"},
-                    "else": {
-                        "$cond": {
-                            "if": {"$ne": ["$rating", None]},
-                            "then": {"$toDouble": {"$ifNull": ["$rating", "0"]}},
-                            "else": 0.0
-                        }
-                    }
-                }
-            },
-
-            # ⭐ ADD INTEREST FIELD (SAFE PARSING)
-            "interest_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$interest"},
-                    "then": "$interest",
-                    "else": {
-                        "$cond": {
-                            "if": {"$ne": ["$interest", None]},
-                            "then": {"$toInt": {"$ifNull": ["$interest", 0]}},
-                            "else": 0
-                        }
-                    }
-                }
-            }
-        }},
-
-        # Sort: Nagpur first → Best NIRF → Most reviews → Best rating
-        {"$sort": {
-            "is_nagpur": -1,
-            "nirf_rank_num": 1,
-            "reviews_num": -1,
-            "rating_num": -1
-            # You can also sort by interest here if wanted:
-            # "interest_num": -1
-        }},
-
-        # Return only what frontend needs
-        {"$project": {
-            "_id": {"$toString": "$_id"},
-            "name": {"$ifNull": ["$name", "Unknown College"]},
-            "state": 1,
-            "district": 1,
-            "city": {"$ifNull": ["$city", "$district", "Unknown"]},
-            "image_url": 1,
-            "rating": {"$ifNull": ["$rating", "N/A"]},
-            "reviews_count": {"$ifNull": ["$reviews_count", "0"]},
-            "nirf_rank": {"$ifNull": ["$nirf_rank", "Not Ranked"]},
-            "website": {"$ifNull": ["$website", ""]},
-            "college_type": 1,
-            "year_established": 1,
-
-            # ⭐ FINAL RETURN VALUE
-            "interest": "$interest_num"
-        }}
-    ]
+
+# Nagpur first → Best NIRF → Most reviews → Best rating (_id breaks ties
+# so the order is total and keyset cursors are stable)
+DIRECTORY_ORDER = [
+    ("is_nagpur", -1),
+    ("nirf_rank_num", 1),
+    ("reviews_num", -1),
+    ("rating_num", -1),
+    ("_id", 1),
+]
+
+
+def _directory_page(collection, query, sort_name, sort):
+    """
+    Run a directory query. With ?limit=/&cursor= it returns one keyset page
+    and {"limit", "next_cursor"}; without them every match, as before.
+    Raises InvalidCursor for a cursor from another query/sort.
+    """
+    limit, cursor = parse_page_args(request.args)
+    if limit is None:
+        docs = collection.find(query, DIRECTORY_FIELDS).sort(sort)
+        return [_directory_row(c) for c in docs], {}
+
+    docs, next_cursor = fetch_page(collection, query, DIRECTORY_FIELDS, sort_name, sort, limit, cursor)
+    return [_directory_row(c) for c in docs], {"limit": limit, "next_cursor": next_cursor}
+
+
+@college_routes.route("/colleges/directory", methods=["GET"])
+def college_directory():
+    db = connect_db()
 
     try:
-        colleges = list(db.College.aggregate(pipeline, allowDiskUse=True))
+        # Only colleges that have a valid image_url
+        colleges, page = _directory_page(db.College, {"has_image": True}, "directory", DIRECTORY_ORDER)
+    except InvalidCursor as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e),
-            "message": "Aggregation failed"
+            "message": "Directory query failed"
         }), 500
 
     return jsonify({
         "success": True,
         "data": colleges,
         "total": len(colleges),
+        **page,
         "message": f"Successfully loaded {len(colleges)} colleges with campus images"
     }), 200
+
+
 # -------------------------------------------------
 # GET /api/colleges/directory/filter
 # Applies search + filters + sorting
 # -------------------------------------------------
 
-@college_routes.route("/colleges/directory/filter", methods=["GET"])
-def college_directory_filter():
-    db = connect_db()
+DIRECTORY_SORTS = {
+    "rating": [("rating_num", -1), ("_id", 1)],
+    "nirf": [("nirf_rank_num", 1), ("_id", 1)],
+    "interest": [("interest", -1), ("_id", 1)],
+    "year": [("year_established", -1), ("_id", 1)],
+    # Relevance default sorting
+    "relevance": [("interest", -1), ("rating_num", -1), ("nirf_rank_num", 1), ("_id", 1)],
+}
 
-    # Read query parameters from frontend
-    search = request.args.get("search", "").strip()
-    state = request.args.get("state", "").strip()
-    college_type = request.args.get("type", "").strip()
-    min_rating = float(request.args.get("min_rating", 0))
-    max_nirf = int(request.args.get("max_nirf", 300))
-    sort_by = request.args.get("sort", "relevance")
 
-    # Base filter
-    base_filter = {
-        "image_url": {"$exists": True, "$ne": None, "$ne": ""}
+SEARCH_CURSOR_ORDER = [("_id", 1)]
+
+
+def _search_page(collection, query, scores):
+    """
+    Search hits ranked by match score, then the usual relevance order.
+    Hits are bounded by the catalog size, so ranking and paging them in
+    memory is cheap; the cursor is the _id of the last row served.
+    """
+    docs = list(collection.find(query, {**DIRECTORY_FIELDS, "rating_num": 1, "nirf_rank_num": 1}))
+    docs.sort(key=lambda d: (
+        -scores[str(d["_id"])],
+        -parse_interest(d.get("interest")),
+        -d.get("rating_num", 0.0),
+        d.get("nirf_rank_num", UNRANKED_NIRF),
+        str(d["_id"]),
+    ))
+
+    limit, cursor = parse_page_args(request.args)
+    page = {}
+    if limit is not None:
+        start = 0
+        if cursor:
+            last_id = str(decode_cursor(cursor, "search", SEARCH_CURSOR_ORDER)[0])
+            ids = [str(d["_id"]) for d in docs]
+            if last_id not in ids:
+                raise InvalidCursor("Cursor no longer matches these search results")
+            start = ids.index(last_id) + 1
+        has_more = len(docs) > start + limit
+        docs = docs[start:start + limit]
+        page = {
+            "limit": limit,
+            "next_cursor": encode_cursor("search", docs[-1], SEARCH_CURSOR_ORDER) if has_more else None,
+        }
+
+    colleges = []
+    for d in docs:
+        row = _directory_row(d)
+        row["search_score"] = scores[row["_id"]]
+        colleges.append(row)
+    return colleges, page
+
+
+def _directory_filters(args):
+    """
+    Mongo clauses for the directory filter parameters, one per dimension,
+    plus the search scores (None without a search). Shared by /filter and
+    /facets, which leaves a dimension's own clause out of its counts.
+    Raises ValueError for a non-numeric min_rating / max_nirf.
+    """
+    # Read query parameters from frontend
+    search = args.get("search", "").strip()
+    state = args.get("state", "").strip()
+    college_type = args.get("type", "").strip()
+    try:
+        min_rating = float(args.get("min_rating", 0))
+    except ValueError:
+        raise ValueError("min_rating must be a number")
+    try:
+        max_nirf = int(args.get("max_nirf", 300))
+    except ValueError:
+        raise ValueError("max_nirf must be an integer")
+
+    # Base filter + minimum rating / maximum NIRF rank filters
+    filters = {
+        "base": {"has_image": True},
+        "rating": {"rating_num": {"$gte": min_rating}},
+        "nirf": {"nirf_rank_num": {"$lte": max_nirf}},
+        "state": {},
+        "college_type": {},
     }
 
-    # Search filter
+    # Search filter: ranked hits from the catalog's trigram index
+    # (name/city/district/state, prefix and typo tolerant). Every hit is
+    # kept: the other filters run in Mongo, and only the page is capped.
+    search_scores = None
     if search:
-        base_filter["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"city": {"$regex": search, "$options": "i"}},
-            {"district": {"$regex": search, "$options": "i"}},
-            {"state": {"$regex": search, "$options": "i"}}
-        ]
+        search_scores = dict(get_catalog().search_index.search(search))
+        filters["base"]["_id"] = {"$in": [college_oid(cid) for cid in search_scores]}
 
     # State filter
     if state:
-        base_filter["state"] = {"$regex": state, "$options": "i"}
+        filters["state"] = {"state": {"$regex": re.escape(state), "$options": "i"}}
 
     # College type filter
     if college_type:
-        base_filter["college_type"] = {"$regex": college_type, "$options": "i"}
+        filters["college_type"] = {"college_type": {"$regex": re.escape(college_type), "$options": "i"}}
 
-    pipeline = [
-        {"$match": base_filter},
-
-        # Compute sortable fields
-        {"$addFields": {
-            "nirf_rank_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$nirf_rank"},
-                    "then": "$nirf_rank",
-                    "else": 999999
-                }
-            },
-            "rating_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$rating"},
-                    "then": "$rating",
-                    "else": {"$toDouble": {"$ifNull": ["$rating", 0]}}
-                }
-            },
-            "interest_num": {
-                "$cond": {
-                    "if": {"$isNumber": "$interest"},
-                    "then": "$interest",
-                    "else": {"$toInt": {"$ifNull": ["$interest", 0]}}
-                }
-            }
-        }},
-
-        # Minimum rating filter
-        {"$match": {"rating_num": {"$gte": min_rating}}},
-
-        # Maximum NIRF rank filter
-        {"$match": {"nirf_rank_num": {"$lte": max_nirf}}}
-    ]
+    return filters, search_scores
 
-    # Sorting logic
-    if sort_by == "rating":
-        pipeline.append({"$sort": {"rating_num": -1}})
-    elif sort_by == "nirf":
-        pipeline.append({"$sort": {"nirf_rank_num": 1}})
-    elif sort_by == "interest":
-        pipeline.append({"$sort": {"interest_num": -1}})
-    elif sort_by == "year":
-        pipeline.append({"$sort": {"year_established": -1}})
-    else:
-        # Relevance default sorting
-        pipeline.append({"$sort": {
-            "interest_num": -1,
-            "rating_num": -1,
-            "nirf_rank_num": 1
-        }})
-
-    # Final projection
-    pipeline.append({
-        "$project": {
-            "_id": {"$toString": "$_id"},
-            "name": 1,
-            "state": 1,
-            "district": 1,
-            "city": 1,
-            "image_url": 1,
-            "rating": 1,
-            "reviews_count": 1,
-            "nirf_rank": 1,
-            "website": 1,
-            "college_type": 1,
-            "year_established": 1,
-            "interest": "$interest_num"
-        }
-    })
+
+def _merge_filters(filters, skip=None):
+    query = {}
+    for dimension, clause in filters.items():
+        if dimension != skip:
+            query.update(clause)
+    return query
+
+
+@college_routes.route("/colleges/directory/filter", methods=["GET"])
+def college_directory_filter():
+    db = connect_db()
 
     try:
-        colleges = list(db.College.aggregate(pipeline, allowDiskUse=True))
+        filters, search_scores = _directory_filters(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    query = _merge_filters(filters)
+    sort_by = request.args.get("sort", "relevance")
+    if sort_by not in DIRECTORY_SORTS:
+        sort_by = "relevance"
+
+    try:
+        if search_scores is not None and sort_by == "relevance":
+            colleges, page = _search_page(db.College, query, search_scores)
+        else:
+            colleges, page = _directory_page(db.College, query, f"filter:{sort_by}", DIRECTORY_SORTS[sort_by])
+    except InvalidCursor as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -659,5 +642,93 @@ def college_directory_filter():
     return jsonify({
         "success": True,
         "data": colleges,
-        "total": len(colleges)
+        "total": len(colleges),
+        **page
     }), 200
+
+
+# -------------------------------------------------
+# GET /api/colleges/directory/facets
+# Filter option counts (state, type, rating and NIRF buckets) for the
+# same parameters as /directory/filter
+# -------------------------------------------------
+
+FACET_PARAMS = ("search", "state", "type", "min_rating", "max_nirf")
+RATING_BUCKETS = [0, 3, 3.5, 4, 4.5, 5.01]
+NIRF_BUCKETS = [1, 11, 51, 101, 201, 301, UNRANKED_NIRF]
+
+# Keyed by catalog version + filter params: a College write bumps the
+# version, so each selection is recounted on its next request.
+facet_cache = LRUCache(max_size=256, ttl_seconds=CATALOG_TTL_SECONDS)
+
+
+def _bucket_facet(rows, boundaries, default_label):
+    counts = {row["_id"]: row["count"] for row in rows}
+    buckets = [
+        {"min": lo, "max": hi, "count": counts.get(lo, 0)}
+        for lo, hi in zip(boundaries, boundaries[1:])
+    ]
+    buckets.append({"label": default_label, "count": counts.get(default_label, 0)})
+    return buckets
+
+
+@college_routes.route("/colleges/directory/facets", methods=["GET"])
+def college_directory_facets():
+    db = connect_db()
+
+    params = tuple((p, request.args.get(p, "").strip()) for p in FACET_PARAMS)
+    cache_key = (get_catalog().version, params)
+    facets = facet_cache.get(cache_key)
+    if facets is not None:
+        return jsonify({"success": True, "data": facets, "cached": True}), 200
+
+    try:
+        filters, _ = _directory_filters(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    def counts_by(field):
+        return [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}, {"$sort": {"count": -1, "_id": 1}}]
+
+    def bucket(field, boundaries, default_label):
+        return [{"$bucket": {
+            "groupBy": f"${field}",
+            "boundaries": boundaries,
+            "default": default_label,
+            "output": {"count": {"$sum": 1}}
+        }}]
+
+    base = filters.pop("base")
+    pipeline = [
+        {"$match": base},
+        # Each facet ignores its own dimension so every option shows how
+        # many results picking it would give
+        {"$facet": {
+            "state": [{"$match": _merge_filters(filters, "state")}] + counts_by("state"),
+            "college_type": [{"$match": _merge_filters(filters, "college_type")}] + counts_by("college_type"),
+            "rating": [{"$match": _merge_filters(filters, "rating")}] + bucket("rating_num", RATING_BUCKETS, "other"),
+            "nirf": [{"$match": _merge_filters(filters, "nirf")}] + bucket("nirf_rank_num", NIRF_BUCKETS, "unranked"),
+            "total": [{"$match": _merge_filters(filters)}, {"$count": "count"}],
+        }}
+    ]
+
+    try:
+        result = next(db.College.aggregate(pipeline), {})
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "Facet aggregation failed"
+        }), 500
+
+    total = result.get("total") or [{"count": 0}]
+    facets = {
+        "state": [{"value": r["_id"], "count": r["count"]} for r in result.get("state", [])],
+        "college_type": [{"value": r["_id"], "count": r["count"]} for r in result.get("college_type", [])],
+        "rating": _bucket_facet(result.get("rating", []), RATING_BUCKETS, "other"),
+        "nirf": _bucket_facet(result.get("nirf", []), NIRF_BUCKETS, "unranked"),
+        "total": total[0]["count"],
+    }
+    facet_cache.put(cache_key, facets)
+
+    return jsonify({"success": True, "data": facets, "cached": False}), 200
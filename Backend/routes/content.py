@@ -1,11 +1,20 @@
 from flask import Blueprint, request, jsonify
 from services.connectDB import connect_db
+from services.ndjson import wants_ndjson, parse_batch_size, ndjson_response
+from services.pagination import InvalidCursor, fetch_page, parse_page_args
+from services.content_fields import HIDDEN_FIELDS, content_search_fields, stream_query, typed_content_fields
 import json
 import os
+from datetime import datetime
 
 content_routes = Blueprint("content_routes", __name__)
 
 
+def _content_to_json(doc):
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+
 # ---------------------------------------------------------
 # ADD CONTENT (existing)
 # ---------------------------------------------------------
@@ -17,27 +26,83 @@ def add_content():
     if not data:
         return jsonify({"success": False, "message": "No input data"}), 400
 
+    # Normalized tags / search tokens / degree codes for /content/streams
+    data.update(content_search_fields(data))
+    # rating / downloads stored as numbers instead of Extended-JSON wrappers
+    # or strings; values that aren't numbers are stored as sent and reported
+    typed, unparsed = typed_content_fields(data)
+    data.update(typed)
+    data["created_at"] = datetime.utcnow()
+
     result = db.Content.insert_one(data)
 
     return jsonify({
         "success": True,
         "message": "Content added successfully",
-        "id": str(result.inserted_id)
+        "id": str(result.inserted_id),
+        "unparsed_fields": unparsed
     }), 201
 
 
 # ---------------------------------------------------------
 # GET ALL CONTENT (existing)
+# ?stream=1 or Accept: application/x-ndjson streams one item per line
+# ?sort=recent|rating|downloads  ?view=summary|full
+# ?limit=&cursor= → one keyset page: {success, data, limit, next_cursor}
+# (without limit/cursor the response is the plain list, as before)
 # ---------------------------------------------------------
+CONTENT_SORTS = {
+    # Not _id: seeded items have numeric-string ids ("9" > "10"), new ones ObjectIds
+    "recent": [("created_at", -1), ("_id", -1)],
+    "rating": [("rating", -1), ("_id", -1)],
+    "downloads": [("downloads", -1), ("_id", -1)],
+}
+
+CONTENT_VIEWS = {
+    # What the resources list renders
+    "summary": {"title": 1, "description": 1, "type": 1, "tags": 1, "rating": 1,
+                "downloads": 1, "readTime": 1},
+    "full": HIDDEN_FIELDS,
+}
+
+
 @content_routes.route("/content/all", methods=["GET"])
 def get_content():
     db = connect_db()
-    content_list = list(db.Content.find())
 
-    for c in content_list:
-        c["_id"] = str(c["_id"])
-
-    return jsonify(content_list), 200
+    view = request.args.get("view", "full")
+    sort_name = request.args.get("sort")
+    if view not in CONTENT_VIEWS:
+        return jsonify({"success": False, "message": f"Unknown view '{view}', expected one of: {', '.join(CONTENT_VIEWS)}"}), 400
+    if sort_name is not None and sort_name not in CONTENT_SORTS:
+        return jsonify({"success": False, "message": f"Unknown sort '{sort_name}', expected one of: {', '.join(CONTENT_SORTS)}"}), 400
+    projection = CONTENT_VIEWS[view]
+
+    if wants_ndjson(request):
+        try:
+            batch_size = parse_batch_size(request.args)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return ndjson_response(db.Content.find({}, projection).batch_size(batch_size), _content_to_json)
+
+    limit, cursor = parse_page_args(request.args)
+    if limit is not None:
+        sort_name = sort_name or "recent"
+        try:
+            docs, next_cursor = fetch_page(db.Content, {}, projection, sort_name, CONTENT_SORTS[sort_name], limit, cursor)
+        except InvalidCursor as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({
+            "success": True,
+            "data": [_content_to_json(c) for c in docs],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }), 200
+
+    docs = db.Content.find({}, projection)
+    if sort_name:
+        docs = docs.sort(CONTENT_SORTS[sort_name])
+    return jsonify([_content_to_json(c) for c in docs]), 200
 
 # ---------------------------------------------------------
 # GET CONTENT BY ID (existing)
@@ -46,7 +111,7 @@ def get_content():
 @content_routes.route("/content/<string:id>", methods=["GET"])
 def get_content_by_id(id):
     db = connect_db()
-    content = db.Content.find_one({"_id": id})
+    content = db.Content.find_one({"_id": id}, HIDDEN_FIELDS)
 
     if content:
         content["_id"] = str(content["_id"])
@@ -63,7 +128,6 @@ def get_content_by_id(id):
 def get_content_by_streams():
     db = connect_db()
     data = request.get_json()
-    print("Received data for streams:", data)
 
     # Validate input
     if not data or "recs" not in data:
@@ -75,99 +139,13 @@ def get_content_by_streams():
         return jsonify({"success": False, "message": "'recs' must be an array of strings"}), 400
 
     if len(recs) == 0:
-        print("bhadwe, kuch nahi manga")
         return jsonify([]), 200  # nothing requested → nothing returned
 
-    # --- helper: generic normalizer for all degree/stream names ---
-    def normalize_label(value):
-        if value is None:
-            print("Warning: normalize_label received None value")
-            return None
-        if not isinstance(value, str):
-            value = str(value)
-
-        # lowercase
-        value = value.lower()
-
-        value = "".join(ch for ch in value if ch.isalnum())
-
-        return value
-
-    normalized_recs = {normalize_label(r) for r in recs if r is not None}
-
-    # Fetch ALL content from DB (no filter in Mongo)
-    contents_cursor = db.Content.find({})
-
+    # One indexed query against the tokens stored by add_content / migrate_content.py
     contents = []
-    for c in contents_cursor:
-        title_raw = c.get("title", "") or ""
-        tags_raw = c.get("tags", []) or []
-
-        # Normalize title and tags
-        normalized_title = normalize_label(title_raw)
-        normalized_tags = [normalize_label(t) for t in tags_raw if t is not None]
-
-        matched = False
-        for rec_norm in normalized_recs:
-            if rec_norm is None:
-                continue
-
-            # 1) rec appears in title (e.g., "btech" in "btechcsefulldetails...") 
-            if rec_norm in normalized_title:
-                matched = True
-                print(f"  -> matched by title using rec={rec_norm!r}")
-                break
-
-            # 2) rec matches any tag (exact or substring both ways)
-            for tag_norm in normalized_tags:
-                if tag_norm is None:
-                    continue
-
-                if (
-                    tag_norm == rec_norm
-                    or tag_norm.startswith(rec_norm)
-                    or rec_norm.startswith(tag_norm)
-                    or rec_norm in tag_norm
-                    or tag_norm in rec_norm
-                ):
-                    matched = True
-                    break
-
-            if matched:
-                break
-
-        if not matched:
-            continue
-
+    for c in db.Content.find(stream_query([r for r in recs if r is not None]), HIDDEN_FIELDS):
         # Make _id JSON-serializable
         if "_id" in c:
             c["_id"] = str(c["_id"])
-
-        # --- Normalize rating ---
-        rating = c.get("rating")
-        if isinstance(rating, dict) and "$numberDouble" in rating:
-            try:
-                c["rating"] = float(rating["$numberDouble"])
-            except (ValueError, TypeError):
-                c["rating"] = None
-        elif isinstance(rating, (int, float, str)):
-            try:
-                c["rating"] = float(rating)
-            except (ValueError, TypeError):
-                pass  # leave as is if it fails
-
-        # --- Normalize downloads ---
-        downloads = c.get("downloads")
-        if isinstance(downloads, dict) and "$numberInt" in downloads:
-            try:
-                c["downloads"] = int(downloads["$numberInt"])
-            except (ValueError, TypeError):
-                c["downloads"] = None
-        elif isinstance(downloads, (int, float, str)):
-            try:
-                c["downloads"] = int(downloads)
-            except (ValueError, TypeError):
-                pass
-
         contents.append(c)
     return jsonify(contents), 200
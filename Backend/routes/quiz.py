@@ -1,12 +1,23 @@
 from flask import Blueprint, request, jsonify
 import json
+import hashlib
 import random
 import os
 from pathlib import Path
 
+import numpy as np
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from services.quiz_sessions import new_session, quiz_session_store
+from services.career_engine import career_engine, TRAIT_NAMES
+from services.mcq_pool import MCQPool, MCQ_POOL_SIGNATURE_LEN
+from services.narrative_jobs import narrative_jobs
+from services.lru_cache import LRUCache
+from services.ndjson import NDJSON_MIMETYPE, wants_ndjson, read_ndjson, ndjson_response
+from services.sse import wants_sse, sse_response
+from services.json_stream import ArrayItemStream
+
 load_dotenv()
 
 quiz_routes = Blueprint("quiz_routes", __name__)
@@ -20,6 +31,27 @@ API_ENV_VAR = "GEMINI_API_KEY"
 TRAITS = ["R", "I", "A", "S", "E", "C"]
 SCORE_MAP = {1: 0.0, 2: 0.25, 3: 0.5, 4: 0.75, 5: 1.0}
 
+# "local" scores careers with services/career_engine (milliseconds) and
+# adds LLM reasons in the background; "llm" asks Gemini for everything.
+RECOMMENDER_ENGINES = ("local", "llm")
+DEFAULT_RECOMMENDER = os.getenv("QUIZ_RECOMMENDER", "local")
+
+# Upper bound on answer sets per /quiz/calculate-scores/batch request
+BATCH_MAX_SUBMISSIONS = int(os.getenv("QUIZ_BATCH_MAX_SUBMISSIONS", "20000"))
+
+# Gemini recommendations keyed on the scores snapped to the SCORE_MAP grid
+# plus the MCQ answers, so near-identical students share one LLM call
+SCORE_GRID = 0.25
+llm_recommendation_cache = LRUCache(
+    max_size=int(os.getenv("QUIZ_REC_CACHE_SIZE", "2000")),
+    ttl_seconds=int(os.getenv("QUIZ_REC_CACHE_TTL_SECONDS", str(6 * 3600))),
+)
+# Same quantized scores + local careers -> narrative job id (see local_recommendations)
+llm_narrative_cache = LRUCache(
+    max_size=int(os.getenv("QUIZ_REC_CACHE_SIZE", "2000")),
+    ttl_seconds=int(os.getenv("QUIZ_REC_CACHE_TTL_SECONDS", str(6 * 3600))),
+)
+
 # Initialize Gemini
 api_key = os.getenv(API_ENV_VAR)
 if api_key:
@@ -34,6 +66,26 @@ if QUESTIONS_FILE.exists():
     with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
         QUESTION_BANK = json.load(f)
 
+# Stable integer question ids: trait index * QUESTION_ID_STRIDE + position
+# in questions.json (append new questions to keep existing ids stable).
+# Sessions track asked questions as one bitset per trait over positions.
+# The bitset is stored as a BSON int64 (bit 63 is the sign), so a trait can
+# have at most 63 questions; that also keeps ids inside the stride.
+QUESTION_ID_STRIDE = 100
+MAX_QUESTIONS_PER_TRAIT = 63
+QUESTIONS_BY_ID = {}
+TRAIT_QUESTION_MASK = {}
+for _trait_idx, _trait in enumerate(TRAITS):
+    _questions = QUESTION_BANK.get(_trait, [])
+    if len(_questions) > MAX_QUESTIONS_PER_TRAIT:
+        raise ValueError(
+            f"questions.json: trait {_trait} has {len(_questions)} questions, "
+            f"at most {MAX_QUESTIONS_PER_TRAIT} fit the session bitset"
+        )
+    TRAIT_QUESTION_MASK[_trait] = (1 << len(_questions)) - 1
+    for _pos, _question in enumerate(_questions):
+        QUESTIONS_BY_ID[_trait_idx * QUESTION_ID_STRIDE + _pos] = (_trait, _question)
+
 
 # ---------------- HELPER FUNCTIONS ----------------
 
@@ -45,6 +97,145 @@ def call_gemini(prompt: str) -> str:
     return getattr(response, "text", str(response))
 
 
+def stream_gemini(prompt: str):
+    """Yield Gemini's reply text chunk by chunk as it is generated."""
+    if not model:
+        raise Exception("Gemini API key not configured")
+    for chunk in model.generate_content(prompt, stream=True):
+        text = getattr(chunk, "text", "")
+        if text:
+            yield text
+
+
+def parse_llm_json(text):
+    """Dict from a model reply, tolerating text around the JSON; None if there is none."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end != -1:
+            try:
+                return json.loads(text[start:end + 1])
+            except ValueError:
+                return None
+        return None
+
+
+def recommendation_cache_key(normalized_scores, qa_history):
+    """(scores quantized to SCORE_GRID, hash of the MCQ answers in qa_history)."""
+    quantized = tuple(round(round(float(normalized_scores.get(t, 0.5)) / SCORE_GRID) * SCORE_GRID, 2) for t in TRAITS)
+    mcq = [(item.get("question", ""), item.get("rating", "")) for item in qa_history if item.get("trait") == "MCQ"]
+    mcq_hash = hashlib.sha1(json.dumps(mcq, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return quantized, mcq_hash
+
+
+def cacheable_recommendations(recommendations):
+    """True for a non-empty list of {career, ...} dicts; refusals and off-schema replies aren't cached."""
+    return (
+        isinstance(recommendations, list) and bool(recommendations)
+        and all(isinstance(r, dict) and isinstance(r.get("career"), str) and r["career"].strip()
+                for r in recommendations)
+    )
+
+
+def llm_recommendations(qa_history, normalized_scores):
+    """
+    (recommendations or None if unparseable, raw model text) from Gemini.
+    Served from llm_recommendation_cache when a similar profile was seen;
+    the raw text is None on a cache hit.
+    """
+    key = recommendation_cache_key(normalized_scores, qa_history)
+    cached = llm_recommendation_cache.get(key)
+    if cached is not None:
+        return cached, None
+
+    text = call_gemini(build_recommendation_prompt(qa_history, normalized_scores)).strip()
+    result = parse_llm_json(text)
+    if not result:
+        return None, text
+    recommendations = result.get("recommendations", [])
+    if cacheable_recommendations(recommendations):
+        llm_recommendation_cache.put(key, recommendations)
+    return recommendations, text
+
+
+def llm_recommendation_stream(qa_history, normalized_scores):
+    """
+    Yield Gemini recommendations one by one, each as soon as its JSON object
+    is complete in the token stream. Shares llm_recommendation_cache with
+    llm_recommendations; raises ValueError if the reply has none.
+    """
+    key = recommendation_cache_key(normalized_scores, qa_history)
+    cached = llm_recommendation_cache.get(key)
+    if cached is not None:
+        yield from cached
+        return
+
+    parser = ArrayItemStream("recommendations")
+    chunks = []
+    recommendations = []
+    for chunk in stream_gemini(build_recommendation_prompt(qa_history, normalized_scores)):
+        chunks.append(chunk)
+        for item in parser.feed(chunk):
+            recommendations.append(item)
+            yield item
+
+    if not parser.done:
+        # Reply wasn't in the expected shape; fall back to parsing it whole
+        result = parse_llm_json("".join(chunks).strip())
+        if not result:
+            raise ValueError("Failed to parse recommendations")
+        for item in result.get("recommendations", [])[len(recommendations):]:
+            recommendations.append(item)
+            yield item
+    if cacheable_recommendations(recommendations):
+        llm_recommendation_cache.put(key, recommendations)
+
+
+def llm_reasons(recommendations, normalized_scores):
+    """{career: reason} narrative text for locally scored careers."""
+    careers = [r["career"] for r in recommendations]
+    prompt = f"""
+You are an expert career counselor.
+
+A student's normalized RIASEC scores (each between 0 and 1):
+{json.dumps(normalized_scores)}
+
+Recommended careers: {json.dumps(careers)}
+
+For each career write a short reason (1–2 sentences) tied to the student's RIASEC strengths.
+Return ONLY valid JSON: {{"reasons": {{"<career>": "<reason>"}}
+"""
+    result = parse_llm_json(call_gemini(prompt).strip()) or {}
+    reasons = result.get("reasons") or {}
+    return {c: reasons[c] for c in careers if isinstance(reasons.get(c), str)}
+
+
+def _reusable_narrative(narrative_id):
+    # A running job or one that produced reasons; failed/empty ones are retried
+    job = narrative_jobs.get(narrative_id) if narrative_id else None
+    return job is not None and (job["status"] == "pending" or (job["status"] == "done" and job.get("result")))
+
+
+def local_recommendations(normalized_scores):
+    """
+    Career matches from the local engine, plus a narrative job id when Gemini
+    is available. Students in the same quantized score bucket with the same
+    careers share one narrative job (llm_narrative_cache), so repeats skip Gemini.
+    """
+    recommendations = career_engine.recommend(normalized_scores)
+    if not model:
+        return recommendations, None
+
+    key = (recommendation_cache_key(normalized_scores, [])[0], tuple(r["career"] for r in recommendations))
+    narrative_id = llm_narrative_cache.get(key)
+    if not _reusable_narrative(narrative_id):
+        narrative_id = narrative_jobs.submit(llm_reasons, recommendations, normalized_scores)
+        llm_narrative_cache.put(key, narrative_id)
+    return recommendations, narrative_id
+
+
 def normalize_scores(raw_scores, questions_asked):
     """Normalize raw scores based on questions asked per trait."""
     normalized = {}
@@ -57,6 +248,217 @@ def normalize_scores(raw_scores, questions_asked):
     return normalized
 
 
+def compute_scores(answers):
+    """(raw_scores, questions_count) from [{trait, rating}], skipping invalid answers."""
+    raw_scores = {t: 0.0 for t in TRAITS}
+    questions_count = {t: 0 for t in TRAITS}
+    for ans in answers:
+        trait = ans.get("trait")
+        rating = ans.get("rating")
+        if trait in TRAITS and isinstance(rating, int) and 1 <= rating <= 5:
+            raw_scores[trait] += SCORE_MAP[rating]
+            questions_count[trait] += 1
+    return raw_scores, questions_count
+
+
+_TRAIT_INDEX = {t: i for i, t in enumerate(TRAITS)}
+
+
+def score_batch(answer_sets):
+    """
+    compute_scores + normalize_scores + top 3 traits for many answer sets
+    in one pass: every valid answer becomes (set index, trait index, value)
+    and np.bincount sums them per (set, trait).
+    Returns (raw, normalized, top) arrays of shape (n, 6), (n, 6), (n, 3).
+    """
+    n = len(answer_sets)
+    cells, values = [], []
+    for set_idx, answers in enumerate(answer_sets):
+        if not isinstance(answers, list):
+            continue  # scored as no answers
+        for ans in answers:
+            trait_idx = _TRAIT_INDEX.get(ans.get("trait")) if isinstance(ans, dict) else None
+            rating = ans.get("rating") if trait_idx is not None else None
+            if trait_idx is not None and isinstance(rating, int) and 1 <= rating <= 5:
+                cells.append(set_idx * len(TRAITS) + trait_idx)
+                values.append(SCORE_MAP[rating])
+
+    cells = np.asarray(cells, dtype=np.int64)
+    size = n * len(TRAITS)
+    # astype: bincount returns ints when there are no cells at all
+    raw = np.bincount(cells, weights=np.asarray(values, dtype=np.float64), minlength=size).astype(np.float64).reshape(n, len(TRAITS))
+    counts = np.bincount(cells, minlength=size).reshape(n, len(TRAITS))
+
+    # Traits with no answers count as neutral (0.5), as in normalize_scores
+    normalized = np.full(raw.shape, 0.5)
+    np.divide(raw, counts, out=normalized, where=counts > 0)
+    normalized = np.round(normalized, 4)
+    top = np.argsort(-normalized, axis=1, kind="stable")[:, :3]
+    return raw, normalized, top
+
+
+def top_traits(normalized_scores, n=3):
+    sorted_traits = sorted(normalized_scores.items(), key=lambda x: x[1], reverse=True)
+    return [{"trait": t, "score": s} for t, s in sorted_traits[:n]]
+
+
+def trait_signature(normalized_scores, n=MCQ_POOL_SIGNATURE_LEN):
+    """Dominant RIASEC letters, strongest first (e.g. "IR"); the MCQ pool key."""
+    return "".join(t["trait"] for t in top_traits(normalized_scores, n))
+
+
+def generate_mcq_questions(num_questions, context):
+    """MCQ list from Gemini for a prompt ending in `context` (Q&A history or a trait profile)."""
+    prompt = f"""
+You are an expert in psychometric assessments.
+Generate EXACTLY {num_questions} MCQs to refine career prediction.
+
+RULES:
+- 4 options: A, B, C, D
+- JSON ONLY in format:
+
+{{
+  "questions": [
+    {{
+      "question": "text",
+      "options": {{
+        "A": "text",
+        "B": "text",
+        "C": "text",
+        "D": "text"
+      }}
+    }}
+  ]
+}}
+
+{context}
+
+Return ONLY JSON.
+"""
+    result = parse_llm_json(call_gemini(prompt).strip()) or {}
+    return result.get("questions", [])
+
+
+def pool_mcq_questions(signature, num_questions):
+    """Generator for mcq_pool: MCQs for students whose strongest traits are `signature`."""
+    traits = ", ".join(f"{TRAIT_NAMES[t]} ({t})" for t in signature)
+    return generate_mcq_questions(
+        num_questions,
+        f"The student's strongest RIASEC traits, in order: {traits}.\n"
+        "Write questions that tell apart the careers these traits point to."
+    )
+
+
+# Refilled in the background; only consulted when Gemini is configured
+mcq_pool = MCQPool(pool_mcq_questions)
+
+
+def recommendation_events(engine, qa_history, normalized_scores, scores_payload):
+    """
+    (event, data) pairs for the SSE variants of /quiz/recommendations and
+    /quiz/submit: "scores" first, one "recommendation" per career, then "done"
+    (or "error" if Gemini fails part-way).
+    """
+    yield "scores", {**scores_payload, "engine": engine}
+
+    count = 0
+    narrative_id = None
+    try:
+        if engine == "local":
+            recommendations, narrative_id = local_recommendations(normalized_scores)
+        elif model:
+            recommendations = llm_recommendation_stream(qa_history, normalized_scores)
+        else:
+            recommendations = []
+        for recommendation in recommendations:
+            yield "recommendation", {"index": count, "recommendation": recommendation}
+            count += 1
+    except Exception as e:
+        print(f"Recommendation stream error: {e}")
+        yield "error", {"message": str(e)}
+
+    yield "done", {"count": count, "engine": engine, "narrative_id": narrative_id}
+
+
+# ---------------- QUIZ SESSIONS ----------------
+
+def _question_payload(question_id):
+    trait, question = QUESTIONS_BY_ID[question_id]
+    return {"question_id": question_id, "trait": trait, "question": question}
+
+
+def _pick_question(asked):
+    """Next question id: a trait with the fewest asked, then an unasked question of it."""
+    counts = {t: bin(asked.get(t, 0)).count("1") for t in TRAITS if TRAIT_QUESTION_MASK.get(t)}
+    if not counts:
+        return None
+    min_count = min(counts.values())
+    trait = random.choice([t for t, c in counts.items() if c == min_count])
+
+    available = TRAIT_QUESTION_MASK[trait] & ~asked.get(trait, 0)
+    if not available:
+        available = TRAIT_QUESTION_MASK[trait]  # all asked: allow repeats, as before
+    positions = [i for i in range(available.bit_length()) if available >> i & 1]
+    return TRAITS.index(trait) * QUESTION_ID_STRIDE + random.choice(positions)
+
+
+def _hand_out(session, question_id):
+    trait, _ = QUESTIONS_BY_ID[question_id]
+    session["asked"][trait] = session["asked"].get(trait, 0) | (1 << (question_id % QUESTION_ID_STRIDE))
+    session["pending"] = question_id
+
+
+def _record_answer(session, data):
+    """
+    Apply {"rating": r} (to the pending question) or {"question_id", "rating"}
+    from a request body. Only questions this session handed out count, each
+    once: re-sending an answer (a retry, or the same body to /recommendations
+    then /submit) is a no-op. Returns an error message or None.
+    """
+    if "rating" not in data:
+        return None
+    answered = {a["id"] for a in session["answers"]}
+    question_id = data.get("question_id", session.get("pending"))
+    if question_id is None and answered:
+        return None  # nothing pending: the last answer was already recorded
+    if question_id not in QUESTIONS_BY_ID:
+        return "Unknown or missing question_id"
+    trait, _ = QUESTIONS_BY_ID[question_id]
+    if not session["asked"].get(trait, 0) >> (question_id % QUESTION_ID_STRIDE) & 1:
+        return "question_id was not asked in this session"
+    if question_id in answered:
+        return None
+    rating = data.get("rating")
+    if not isinstance(rating, int) or not 1 <= rating <= 5:
+        return "rating must be an integer from 1 to 5"
+    session["answers"].append({"id": question_id, "trait": trait, "rating": rating})
+    if session.get("pending") == question_id:
+        session["pending"] = None
+    return None
+
+
+def _load_session(data):
+    """(session, None) for the body's session_id with its latest answer applied, or (None, error response)."""
+    session = quiz_session_store.get(data.get("session_id"))
+    if session is None:
+        return None, (jsonify({"success": False, "message": "Quiz session not found or expired"}), 404)
+    error = _record_answer(session, data)
+    if error:
+        return None, (jsonify({"success": False, "message": error}), 400)
+    mcq_answers = data.get("mcq_answers")
+    if isinstance(mcq_answers, list):
+        session["mcq_answers"] = mcq_answers
+    return session, None
+
+
+def session_qa_history(session):
+    """The session's answers in the {trait, question, rating} shape the prompts use."""
+    return [
+        {"trait": a["trait"], "question": QUESTIONS_BY_ID[a["id"]][1], "rating": a["rating"]}
+        for a in session["answers"] if a["id"] in QUESTIONS_BY_ID
+    ]
+
+
 def build_recommendation_prompt(qa_history, normalized_scores):
     """Build the prompt for career recommendations."""
     qa_lines = [
@@ -144,18 +546,61 @@ def get_questions():
     return jsonify({
         "success": True,
         "questions": QUESTION_BANK,
+        "question_ids": {
+            t: [TRAITS.index(t) * QUESTION_ID_STRIDE + i for i in range(len(QUESTION_BANK.get(t, [])))]
+            for t in TRAITS
+        },
         "traits": TRAITS
     }), 200
 
 
+# POST /api/quiz/session - Start a server-side quiz session
+@quiz_routes.route("/quiz/session", methods=["POST"])
+def start_session():
+    """
+    Create a session and hand out its first question. Afterwards the client
+    posts { "session_id", "rating" } to /quiz/next-question per answer.
+    """
+    session = new_session(TRAITS)
+    question_id = _pick_question(session["asked"])
+    if question_id is None:
+        return jsonify({"success": False, "message": "No questions available"}), 400
+    _hand_out(session, question_id)
+    quiz_session_store.save(session)
+
+    return jsonify({
+        "success": True,
+        "session_id": session["_id"],
+        **_question_payload(question_id)
+    }), 201
+
+
 # POST /api/quiz/next-question - Get next adaptive question
 @quiz_routes.route("/quiz/next-question", methods=["POST"])
 def get_next_question():
     """
     Adaptive question selection - picks trait with fewest asked.
     Body: { "questions_asked": { "R": ["q1", "q2"], "I": [], ... } }
+      or: { "session_id": "...", "rating": 4 }  (answer to the last question handed out)
     """
     data = request.get_json() or {}
+
+    if data.get("session_id"):
+        session, error = _load_session(data)
+        if error:
+            return error
+        question_id = _pick_question(session["asked"])
+        if question_id is None:
+            return jsonify({"success": False, "message": "No questions available"}), 400
+        _hand_out(session, question_id)
+        quiz_session_store.save(session)
+        return jsonify({
+            "success": True,
+            "session_id": session["_id"],
+            "answered": len(session["answers"]),
+            **_question_payload(question_id)
+        }), 200
+
     questions_asked = data.get("questions_asked", {t: [] for t in TRAITS})
 
     # Find trait with fewest questions asked
@@ -202,28 +647,83 @@ def calculate_scores():
     if not answers:
         return jsonify({"success": False, "message": "No answers provided"}), 400
 
-    raw_scores = {t: 0.0 for t in TRAITS}
-    questions_count = {t: 0 for t in TRAITS}
-
-    for ans in answers:
-        trait = ans.get("trait")
-        rating = ans.get("rating")
-
-        if trait in TRAITS and isinstance(rating, int) and 1 <= rating <= 5:
-            raw_scores[trait] += SCORE_MAP[rating]
-            questions_count[trait] += 1
-
+    raw_scores, questions_count = compute_scores(answers)
     normalized = normalize_scores(raw_scores, questions_count)
 
-    # Find top 3 traits
-    sorted_traits = sorted(normalized.items(), key=lambda x: x[1], reverse=True)
-    top_traits = [{"trait": t, "score": s} for t, s in sorted_traits[:3]]
-
     return jsonify({
         "success": True,
         "raw_scores": raw_scores,
         "normalized_scores": normalized,
-        "top_traits": top_traits
+        # Find top 3 traits
+        "top_traits": top_traits(normalized)
+    }), 200
+
+
+# POST /api/quiz/calculate-scores/batch - Score many answer sets at once
+@quiz_routes.route("/quiz/calculate-scores/batch", methods=["POST"])
+def calculate_scores_batch():
+    """
+    Bulk version of /quiz/calculate-scores for whole classes.
+    Body (JSON): { "submissions": [ { "id": "<student>", "answers": [...] }, ... ] }
+    or NDJSON (Content-Type: application/x-ndjson): one { "id", "answers" } per line.
+    Responds with NDJSON (one result per line) when the request was NDJSON,
+    ?stream=1 or Accept: application/x-ndjson; otherwise one JSON document.
+    """
+    is_ndjson = NDJSON_MIMETYPE in (request.content_type or "")
+    if is_ndjson:
+        try:
+            submissions = read_ndjson(request)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+    else:
+        body = request.get_json(silent=True)
+        if body is None:
+            body = {}
+        if not isinstance(body, dict):
+            return jsonify({"success": False, "message": "Body must be a JSON object: { \"submissions\": [...] }"}), 400
+        submissions = body.get("submissions", [])
+
+    if not isinstance(submissions, list) or not submissions:
+        return jsonify({"success": False, "message": "No submissions provided"}), 400
+    if len(submissions) > BATCH_MAX_SUBMISSIONS:
+        return jsonify({"success": False, "message": f"At most {BATCH_MAX_SUBMISSIONS} submissions per request"}), 413
+
+    # A malformed row is reported in its own result, not fatal to the batch
+    ids, answer_sets, errors = [], [], {}
+    for i, sub in enumerate(submissions):
+        if not isinstance(sub, dict):
+            ids.append(i)
+            answer_sets.append([])
+            errors[i] = "Expected an object with id and answers"
+            continue
+        answers = sub.get("answers") or []
+        ids.append(sub.get("id", i))
+        if not isinstance(answers, list):
+            errors[i] = "answers must be a list"
+            answers = []
+        answer_sets.append(answers)
+    raw, normalized, top = score_batch(answer_sets)
+
+    def results():
+        for i, student_id in enumerate(ids):
+            if i in errors:
+                yield {"id": student_id, "error": errors[i]}
+                continue
+            yield {
+                "id": student_id,
+                "raw_scores": dict(zip(TRAITS, raw[i].tolist())),
+                "normalized_scores": dict(zip(TRAITS, normalized[i].tolist())),
+                "top_traits": [{"trait": TRAITS[t], "score": normalized[i, t].item()} for t in top[i]],
+            }
+
+    if is_ndjson or wants_ndjson(request):
+        return ndjson_response(results())
+
+    return jsonify({
+        "success": True,
+        "count": len(ids),
+        "invalid": len(errors),
+        "results": list(results())
     }), 200
 
 
@@ -250,64 +750,45 @@ def generate_mcq():
     if not model:
         return jsonify({"success": False, "message": "Gemini API not configured"}), 500
 
+    if not isinstance(num_questions, int) or num_questions < 1:
+        return jsonify({"success": False, "message": "num_questions must be a positive integer"}), 400
+
+    # Pre-generated set for the student's dominant traits when the pool has one
+    if num_questions <= mcq_pool.set_size:
+        raw_scores, questions_count = compute_scores(qa_history)
+        questions = mcq_pool.take(trait_signature(normalize_scores(raw_scores, questions_count)))
+        if questions:
+            return jsonify({
+                "success": True,
+                "questions": questions[:num_questions],
+                "source": "pool"
+            }), 200
+
     qa_lines = [
         f"{idx}. Trait={item['trait']} | Q='{item['question']}' | Rating={item['rating']}"
         for idx, item in enumerate(qa_history, 1)
     ]
     qa_block = "\n".join(qa_lines)
 
-    prompt = f"""
-You are an expert in psychometric assessments.
-Generate EXACTLY {num_questions} MCQs to refine career prediction.
-
-RULES:
-- 4 options: A, B, C, D
-- JSON ONLY in format:
-
-{{
-  "questions": [
-    {{
-      "question": "text",
-      "options": {{
-        "A": "text",
-        "B": "text",
-        "C": "text",
-        "D": "text"
-      }}
-    }}
-  ]
-}}
-
-User Q&A history:
-{qa_block}
-
-Return ONLY JSON.
-"""
-
     try:
-        text = call_gemini(prompt).strip()
-
-        # Try direct JSON parse
-        try:
-            questions = json.loads(text).get("questions", [])
-        except:
-            # Try extracting JSON from response
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1:
-                questions = json.loads(text[start:end + 1]).get("questions", [])
-            else:
-                questions = []
+        questions = generate_mcq_questions(num_questions, f"User Q&A history:\n{qa_block}")
 
         return jsonify({
             "success": True,
-            "questions": questions
+            "questions": questions,
+            "source": "live"
         }), 200
 
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+# GET /api/quiz/mcq-pool/stats - Fill level and hit rate of the pre-generated MCQ pool
+@quiz_routes.route("/quiz/mcq-pool/stats", methods=["GET"])
+def mcq_pool_stats():
+    return jsonify({"success": True, **mcq_pool.snapshot_stats()}), 200
+
+
 # POST /api/quiz/recommendations - Get career recommendations
 @quiz_routes.route("/quiz/recommendations", methods=["POST"])
 def get_recommendations():
@@ -318,54 +799,64 @@ def get_recommendations():
             { "trait": "R", "question": "...", "rating": 4 },
             ...
         ],
-        "normalized_scores": { "R": 0.75, "I": 0.5, ... }  # optional
+        "normalized_scores": { "R": 0.75, "I": 0.5, ... },  # optional
+        "engine": "local" | "llm"  # optional, also ?engine=
     }
+    or: { "session_id": "...", "rating": 4 }  (rating optional: last answer)
+    With Accept: text/event-stream (or ?stream=sse) the response is SSE, see recommendation_events.
     """
     data = request.get_json() or {}
     qa_history = data.get("qa_history", [])
     normalized_scores = data.get("normalized_scores")
 
-    if not qa_history:
+    if data.get("session_id"):
+        session, error = _load_session(data)
+        if error:
+            return error
+        quiz_session_store.save(session)
+        qa_history = session_qa_history(session)
+
+    engine = request.args.get("engine") or data.get("engine") or DEFAULT_RECOMMENDER
+    if engine not in RECOMMENDER_ENGINES:
+        return jsonify({"success": False, "message": f"engine must be one of: {', '.join(RECOMMENDER_ENGINES)}"}), 400
+
+    if not qa_history and not normalized_scores:
         return jsonify({"success": False, "message": "No Q&A history provided"}), 400
 
-    if not model:
+    if engine == "llm" and not model:
         return jsonify({"success": False, "message": "Gemini API not configured"}), 500
 
     # Calculate scores if not provided
     if not normalized_scores:
-        raw_scores = {t: 0.0 for t in TRAITS}
-        questions_count = {t: 0 for t in TRAITS}
+        raw_scores, questions_count = compute_scores(qa_history)
+        normalized_scores = normalize_scores(raw_scores, questions_count)
 
-        for ans in qa_history:
-            trait = ans.get("trait")
-            rating = ans.get("rating")
-            if trait in TRAITS and isinstance(rating, int) and 1 <= rating <= 5:
-                raw_scores[trait] += SCORE_MAP[rating]
-                questions_count[trait] += 1
+    if wants_sse(request):
+        return sse_response(recommendation_events(engine, qa_history, normalized_scores, {
+            "normalized_scores": normalized_scores,
+            "top_traits": top_traits(normalized_scores)
+        }))
 
-        normalized_scores = normalize_scores(raw_scores, questions_count)
+    if engine == "local":
+        recommendations, narrative_id = local_recommendations(normalized_scores)
+        return jsonify({
+            "success": True,
+            "recommendations": recommendations,
+            "normalized_scores": normalized_scores,
+            "engine": engine,
+            # Poll GET /api/quiz/narratives/<narrative_id> for LLM-written reasons
+            "narrative_id": narrative_id
+        }), 200
 
     try:
-        prompt = build_recommendation_prompt(qa_history, normalized_scores)
-        text = call_gemini(prompt).strip()
+        recommendations, text = llm_recommendations(qa_history, normalized_scores)
 
-        # Try direct JSON parse
-        try:
-            result = json.loads(text)
-        except:
-            # Try extracting JSON from response
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1:
-                result = json.loads(text[start:end + 1])
-            else:
-                result = None
-
-        if result:
+        if recommendations is not None:
             return jsonify({
                 "success": True,
-                "recommendations": result.get("recommendations", []),
-                "normalized_scores": normalized_scores
+                "recommendations": recommendations,
+                "normalized_scores": normalized_scores,
+                "engine": engine
             }), 200
         else:
             return jsonify({
@@ -378,6 +869,32 @@ def get_recommendations():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+# GET /api/quiz/recommendations/cache-stats - Hit rate of the Gemini recommendation cache
+@quiz_routes.route("/quiz/recommendations/cache-stats", methods=["GET"])
+def recommendation_cache_stats():
+    return jsonify({
+        "success": True,
+        **llm_recommendation_cache.stats(),
+        "narratives": llm_narrative_cache.stats()
+    }), 200
+
+
+# GET /api/quiz/narratives/<narrative_id> - LLM reasons for local recommendations
+@quiz_routes.route("/quiz/narratives/<narrative_id>", methods=["GET"])
+def get_narrative(narrative_id):
+    """{ status: pending | done | error, reasons: { career: reason } }"""
+    job = narrative_jobs.get(narrative_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Narrative not found or expired"}), 404
+
+    return jsonify({
+        "success": job["status"] != "error",
+        "status": job["status"],
+        "reasons": job.get("result", {}),
+        **({"message": job["message"]} if "message" in job else {})
+    }), 200
+
+
 # POST /api/quiz/submit - Complete quiz submission (all-in-one)
 @quiz_routes.route("/quiz/submit", methods=["POST"])
 def submit_quiz():
@@ -391,27 +908,29 @@ def submit_quiz():
         "mcq_answers": [  # optional
             { "question": "...", "answer": "A" },
             ...
-        ]
+        ],
+        "engine": "local" | "llm"  # optional, also ?engine=
     }
+    or: { "session_id": "...", "rating": 4, "mcq_answers": [...] }  (rating / mcq_answers optional)
+    With Accept: text/event-stream (or ?stream=sse) the response is SSE, see recommendation_events.
     """
     data = request.get_json() or {}
     answers = data.get("answers", [])
     mcq_answers = data.get("mcq_answers", [])
 
+    if data.get("session_id"):
+        session, error = _load_session(data)
+        if error:
+            return error
+        quiz_session_store.save(session)
+        answers = session_qa_history(session)
+        mcq_answers = session["mcq_answers"]
+
     if not answers:
         return jsonify({"success": False, "message": "No answers provided"}), 400
 
     # Calculate scores
-    raw_scores = {t: 0.0 for t in TRAITS}
-    questions_count = {t: 0 for t in TRAITS}
-
-    for ans in answers:
-        trait = ans.get("trait")
-        rating = ans.get("rating")
-        if trait in TRAITS and isinstance(rating, int) and 1 <= rating <= 5:
-            raw_scores[trait] += SCORE_MAP[rating]
-            questions_count[trait] += 1
-
+    raw_scores, questions_count = compute_scores(answers)
     normalized_scores = normalize_scores(raw_scores, questions_count)
 
     # Build Q&A history including MCQs
@@ -423,33 +942,35 @@ def submit_quiz():
             "rating": mcq.get("answer", "")
         })
 
-    # Get recommendations if Gemini is configured
+    engine = request.args.get("engine") or data.get("engine") or DEFAULT_RECOMMENDER
+    if engine not in RECOMMENDER_ENGINES:
+        return jsonify({"success": False, "message": f"engine must be one of: {', '.join(RECOMMENDER_ENGINES)}"}), 400
+
+    if wants_sse(request):
+        return sse_response(recommendation_events(engine, qa_history, normalized_scores, {
+            "raw_scores": raw_scores,
+            "normalized_scores": normalized_scores,
+            "top_traits": top_traits(normalized_scores)
+        }))
+
     recommendations = []
-    if model:
+    narrative_id = None
+    if engine == "local":
+        recommendations, narrative_id = local_recommendations(normalized_scores)
+    # Get recommendations if Gemini is configured
+    elif model:
         try:
-            prompt = build_recommendation_prompt(qa_history, normalized_scores)
-            text = call_gemini(prompt).strip()
-
-            try:
-                result = json.loads(text)
-                recommendations = result.get("recommendations", [])
-            except:
-                start = text.find("{")
-                end = text.rfind("}")
-                if start != -1 and end != -1:
-                    result = json.loads(text[start:end + 1])
-                    recommendations = result.get("recommendations", [])
+            recommendations = llm_recommendations(qa_history, normalized_scores)[0] or []
         except Exception as e:
             print(f"Recommendation error: {e}")
 
-    # Find top traits
-    sorted_traits = sorted(normalized_scores.items(), key=lambda x: x[1], reverse=True)
-    top_traits = [{"trait": t, "score": s} for t, s in sorted_traits[:3]]
-
     return jsonify({
         "success": True,
         "raw_scores": raw_scores,
         "normalized_scores": normalized_scores,
-        "top_traits": top_traits,
-        "recommendations": recommendations
+        # Find top traits
+        "top_traits": top_traits(normalized_scores),
+        "recommendations": recommendations,
+        "engine": engine,
+        "narrative_id": narrative_id
     }), 200
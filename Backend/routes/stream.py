@@ -3,6 +3,7 @@ data recheck """
 
 from flask import Blueprint, request, jsonify
 from services.connectDB import connect_db
+from services.degree_taxonomy import canonical_degree
 
 stream_routes = Blueprint("stream_routes", __name__)
 
@@ -84,18 +85,8 @@ DEGREE_INFO = {
 }
 
 def get_degree_details(short_name):
-    """Get degree details by short_name, with fuzzy matching fallback."""
-    short_upper = short_name.upper().strip()
-    info = DEGREE_INFO.get(short_upper)
-    if info:
-        return info
-    
-    # Fuzzy fallback: check for partial matches
-    for key, val in DEGREE_INFO.items():
-        if key in short_upper or short_upper in key:
-            return val
-    
-    return None
+    """Get degree details by short_name or any alias ("B.Tech", "Bachelor of Technology")."""
+    return DEGREE_INFO.get(canonical_degree(short_name) or short_name.upper().strip())
 
 @stream_routes.route("/streams", methods=["POST"])
 def add_stream():
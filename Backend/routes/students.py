@@ -3,6 +3,8 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 from services.connectDB import connect_db
+from services.recommendation_cache import recommendation_cache
+from services.ndjson import wants_ndjson, parse_batch_size, ndjson_response
 
 students_routes = Blueprint("students_routes", __name__)
 
@@ -140,6 +142,10 @@ def update_student(user_id):
     if result.matched_count == 0:
         return jsonify({"success": False, "message": "Student not found"}), 404
 
+    # New quiz results → recompute college recommendations on next load
+    if "quiz_results" in update_fields:
+        recommendation_cache.invalidate(user_id)
+
     student = db.Students.find_one({"user_id": user_id})
 
     return jsonify({
@@ -151,5 +157,14 @@ def update_student(user_id):
 @students_routes.route("/students", methods=["GET"])
 def get_students():
     db = connect_db()
+
+    # Export mode: ?stream=1 or Accept: application/x-ndjson
+    if wants_ndjson(request):
+        try:
+            batch_size = parse_batch_size(request.args)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return ndjson_response(db.Students.find().batch_size(batch_size), _doc_to_json)
+
     students = [_doc_to_json(s) for s in db.Students.find()]
     return jsonify(students), 200
\ No newline at end of file
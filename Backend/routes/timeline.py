@@ -1,28 +1,95 @@
+from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
 from services.connectDB import connect_db
+from services.degree_taxonomy import degree_code
+from services.timeline_exams import TIMELINE_EXAMS_COLLECTION, LEGACY_EXAMS_KEY, serialize_exam
 
 timeline_routes = Blueprint("timeline_routes", __name__)
 
+UPCOMING_DEFAULT_DAYS = 30
+UPCOMING_MAX_DAYS = 366
+
 
 @timeline_routes.route("/timeline", methods=["GET"])
 def get_timeline():
     db = connect_db()
     short_name_query = request.args.get("short_name")
 
-    # Fetch the only document
+    # One document per exam (see migrate_timeline.py); degree_codes is indexed
+    query = {"degree_codes": degree_code(short_name_query)} if short_name_query else {}
+    exams = [serialize_exam(e) for e in db[TIMELINE_EXAMS_COLLECTION].find(query).sort("order", 1)]
+    if exams or db[TIMELINE_EXAMS_COLLECTION].find_one({}, {"_id": 1}):
+        return jsonify(exams), 200
+
+    # Not migrated yet: fall back to the single legacy document
     data = db.timeline.find_one()
 
     if not data:
         return jsonify([]), 200
 
-    exams = data.get("upcoming_entrance_exams_2026", [])
+    exams = data.get(LEGACY_EXAMS_KEY, [])
 
     # If filtering by short_name
     if short_name_query:
-        short_name_query = short_name_query.lower()
+        code = degree_code(short_name_query)
         exams = [
             exam for exam in exams
-            if any(sn.lower() == short_name_query for sn in exam.get("short_name", []))
+            if code in (exam.get("degree_codes") or [degree_code(sn) for sn in exam.get("short_name", [])])
         ]
 
     return jsonify(exams), 200
+
+
+# -------------------------------------------------
+# GET /api/timeline/upcoming?days=30&short_name=BTECH
+# Events whose [start, end] overlaps the next `days` days, soonest first
+# -------------------------------------------------
+@timeline_routes.route("/timeline/upcoming", methods=["GET"])
+def get_upcoming_events():
+    db = connect_db()
+
+    try:
+        days = int(request.args.get("days", UPCOMING_DEFAULT_DAYS))
+    except ValueError:
+        return jsonify({"success": False, "message": "days must be an integer"}), 400
+    days = max(0, min(days, UPCOMING_MAX_DAYS))
+
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    horizon = today + timedelta(days=days)
+    in_window = {"end": {"$gte": today}, "start": {"$lte": horizon}}
+
+    match = {"events": {"$elemMatch": in_window}}
+    short_name_query = request.args.get("short_name")
+    if short_name_query:
+        match["degree_codes"] = degree_code(short_name_query)
+
+    pipeline = [
+        {"$match": match},
+        {"$unwind": "$events"},
+        {"$match": {f"events.{k}": v for k, v in in_window.items()}},
+        {"$sort": {"events.start": 1, "order": 1}},
+        {"$project": {
+            "_id": 0,
+            "exam": 1,
+            "short_name": 1,
+            "conducting_body": 1,
+            "official_website": 1,
+            "event": "$events.event",
+            "date": "$events.date",
+            "status": "$events.status",
+            "start": "$events.start",
+            "end": "$events.end",
+        }},
+    ]
+    events = list(db[TIMELINE_EXAMS_COLLECTION].aggregate(pipeline))
+    for event in events:
+        event["start"] = event["start"].date().isoformat()
+        event["end"] = event["end"].date().isoformat()
+
+    return jsonify({
+        "success": True,
+        "from": today.date().isoformat(),
+        "to": horizon.date().isoformat(),
+        "data": events,
+        "count": len(events),
+    }), 200
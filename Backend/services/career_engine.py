@@ -0,0 +1,78 @@
+# Backend/services/career_engine.py
+#
+# Local RIASEC → career scoring. career_profiles.json gives each career a
+# RIASEC weight vector plus its stream and degree/specialization lists;
+# a student's normalized scores are matched against all careers at once
+# with cosine similarity over mean-centred vectors (so "high in I and C"
+# matters, not the overall level of the answers).
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+PROFILES_FILE = Path(__file__).resolve().parent / "career_profiles.json"
+TRAITS = ["R", "I", "A", "S", "E", "C"]
+
+TRAIT_NAMES = {
+    "R": "Realistic",
+    "I": "Investigative",
+    "A": "Artistic",
+    "S": "Social",
+    "E": "Enterprising",
+    "C": "Conventional",
+}
+
+
+def _centred_unit_rows(matrix):
+    centred = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centred, axis=1, keepdims=True)
+    return np.divide(centred, norms, out=np.zeros_like(centred), where=norms > 0)
+
+
+class CareerEngine:
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.weights = np.array([[p["riasec"].get(t, 0.0) for t in TRAITS] for p in profiles], dtype=np.float64)
+        self.unit_weights = _centred_unit_rows(self.weights)
+
+    @classmethod
+    def from_file(cls, path=PROFILES_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def similarities(self, normalized_scores):
+        """Similarity of every career to the scores, in profile order."""
+        vector = np.array([[float(normalized_scores.get(t, 0.5)) for t in TRAITS]])
+        unit = _centred_unit_rows(vector)[0]
+        if not unit.any():
+            # Flat answers carry no direction; fall back to plain cosine
+            raw = vector[0] / (np.linalg.norm(vector[0]) or 1.0)
+            return (self.weights / np.linalg.norm(self.weights, axis=1, keepdims=True)) @ raw
+        return self.unit_weights @ unit
+
+    def recommend(self, normalized_scores, k=3):
+        """Top-k careers in the /quiz/recommendations schema, best first."""
+        scores = self.similarities(normalized_scores)
+        k = min(k, len(self.profiles))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        student_top = sorted(TRAITS, key=lambda t: normalized_scores.get(t, 0.5), reverse=True)[:2]
+        return [self._recommendation(self.profiles[i], float(scores[i]), student_top) for i in best]
+
+    @staticmethod
+    def _recommendation(profile, score, student_top):
+        career_top = sorted(TRAITS, key=lambda t: profile["riasec"].get(t, 0.0), reverse=True)[:3]
+        shared = [t for t in student_top if t in career_top] or student_top[:1]
+        traits_text = " and ".join(TRAIT_NAMES[t] for t in shared)
+        return {
+            "career": profile["career"],
+            "reason": f"Your strong {traits_text} traits fit the day-to-day work of this career.",
+            "stream": profile["stream"],
+            "degrees": profile["degrees"],
+            "match_score": round(score, 4),
+        }
+
+
+career_engine = CareerEngine.from_file()
@@ -0,0 +1,217 @@
+# Backend/services/college_catalog.py
+#
+# In-process snapshot of the College collection. Read paths serve from the
+# snapshot instead of scanning Mongo on every request; write routes call
+# refresh_catalog() so the next read sees their changes. Snapshots are
+# built outside any lock readers take: after the TTL one background thread
+# reloads while requests keep getting the old snapshot, then the reference
+# is swapped.
+
+import os
+import re
+import threading
+import time
+
+from services.connectDB import connect_db
+from services.college_fields import parse_interest
+from services.college_index import CourseIndex, CollegeRanking
+from services.search_index import TrigramIndex
+from services.interest_buffer import interest_buffer
+
+# Upper bound on staleness for writes that bypass the routes
+# (upload_to_mongo.py, other workers, manual edits in Atlas).
+CATALOG_TTL_SECONDS = int(os.getenv("CATALOG_TTL_SECONDS", "300"))
+
+# Fields behind the directory search box and their weight in the ranking
+SEARCH_FIELDS = {"name": 3, "city": 2, "district": 2, "state": 1}
+
+# One loader at a time; readers never take it once a snapshot exists
+_reload_lock = threading.Lock()
+# Interest counters of the live snapshot, and increments seen mid-reload
+_interest_lock = threading.Lock()
+_reload_increments = None
+_snapshot = None
+_version = 0
+
+
+# Named projections for list views (GET /colleges?view=...). None means
+# the whole document.
+COLLEGE_VIEWS = {
+    "card": ("name", "district", "state", "rating", "reviews_count", "nirf_rank",
+             "college_type", "image_url", "interest"),
+    "full": None,
+}
+
+_FIELD_RE = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+
+def resolve_college_fields(view=None, fields=None):
+    """
+    Field tuple for a request: an explicit comma-separated `fields=` list
+    wins over a named `view=`. Returns None for the full document and
+    raises ValueError for an unknown view or malformed field name.
+    """
+    if fields:
+        names = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        bad = [f for f in names if not _FIELD_RE.match(f)]
+        if not names or bad:
+            raise ValueError(f"Invalid fields: {', '.join(bad) or fields}")
+        return names
+    if view:
+        if view not in COLLEGE_VIEWS:
+            raise ValueError(f"Unknown view '{view}', expected one of: {', '.join(COLLEGE_VIEWS)}")
+        return COLLEGE_VIEWS[view]
+    return None
+
+
+def project_college(college, fields):
+    """
+    Trim a serialized college to `fields`, with Mongo projection semantics
+    for dotted paths (also through arrays, e.g. "courses.name"). _id is
+    always kept.
+    """
+    if fields is None:
+        return college
+    out = {"_id": college["_id"]}
+    for field in fields:
+        _merge_path(out, college, field.split("."))
+    return out
+
+
+def _merge_path(out, doc, path):
+    head, rest = path[0], path[1:]
+    if head not in doc:
+        return
+    value = doc[head]
+    if not rest:
+        out[head] = value
+    elif isinstance(value, dict):
+        _merge_path(out.setdefault(head, {}), value, rest)
+    elif isinstance(value, list):
+        items = [v for v in value if isinstance(v, dict)]
+        projected = out.setdefault(head, [{} for _ in items])
+        for target, item in zip(projected, items):
+            _merge_path(target, item, rest)
+
+
+def serialize_college(doc):
+    doc["_id"] = str(doc["_id"])
+    # Ensure interest is always present
+    doc["interest"] = parse_interest(doc.get("interest"))
+    return doc
+
+
+class CatalogSnapshot:
+    """
+    One loaded version of the College collection.
+
+    - colleges: serialized documents, in collection order
+    - by_id: _id (str) -> serialized document
+    - course_index: degree/specialization postings for recommendations
+    - ranking: precomputed recommendation order (see CollegeRanking)
+    - search_index: trigram index over SEARCH_FIELDS for directory search
+    """
+
+    def __init__(self, version, docs):
+        self.version = version
+        self.loaded_at = time.time()
+        self.colleges = [serialize_college(d) for d in docs]
+        self.by_id = {c["_id"]: c for c in self.colleges}
+        self.total_interest = sum(c["interest"] for c in self.colleges)
+        self.course_index = CourseIndex(self.colleges)
+        self.ranking = CollegeRanking(self.colleges)
+        self.search_index = TrigramIndex(self.colleges, SEARCH_FIELDS)
+
+    def is_stale(self):
+        return time.time() - self.loaded_at > CATALOG_TTL_SECONDS
+
+    def add_interest(self, increments):
+        # Caller holds _interest_lock
+        for college_id, inc in increments.items():
+            college = self.by_id.get(str(college_id))
+            if college is None:
+                continue
+            college["interest"] += inc
+            self.total_interest += inc
+
+
+def get_catalog():
+    """
+    Return the current snapshot. Only the first load blocks; a stale
+    snapshot is still served while one background thread reloads it.
+    """
+    snapshot = _snapshot
+    if snapshot is None:
+        with _reload_lock:
+            # Another request may have loaded while we waited for the lock
+            if _snapshot is None:
+                _load()
+        return _snapshot
+    if snapshot.is_stale() and _reload_lock.acquire(blocking=False):
+        threading.Thread(target=_background_reload, name="catalog-reload", daemon=True).start()
+    return snapshot
+
+
+def refresh_catalog():
+    """Reload the snapshot from Mongo. Call after any College write."""
+    with _reload_lock:
+        _load()
+        return _snapshot
+
+
+def catalog_version():
+    return get_catalog().version
+
+
+def record_interest(increments):
+    """
+    Queue interest increments ({college_id: inc}) in the write-behind buffer
+    and fold them into the live snapshot. Interest only changes counters, so
+    this avoids a full reload and does not bump the catalog version.
+    """
+    with _interest_lock:
+        interest_buffer.add(increments)
+        if _snapshot is not None:
+            _snapshot.add_interest(increments)
+        if _reload_increments is not None:
+            for college_id, inc in increments.items():
+                _reload_increments[college_id] = _reload_increments.get(college_id, 0) + inc
+
+
+def _background_reload():
+    # Started with _reload_lock held by get_catalog
+    try:
+        _load()
+    except Exception as e:
+        print("❌ College catalog reload failed, serving the previous snapshot:", e)
+    finally:
+        _reload_lock.release()
+
+
+def _load():
+    # Caller holds _reload_lock
+    global _snapshot, _version, _reload_increments
+    db = connect_db()
+    # No flush may land between the fetch and reading what is still
+    # pending, or its increments would be in neither
+    with interest_buffer.flush_lock:
+        docs = list(db.College.find())
+        with _interest_lock:
+            unflushed = interest_buffer.pending_increments()
+            _reload_increments = {}
+
+    try:
+        snapshot = CatalogSnapshot(_version + 1, docs)
+    except Exception:
+        with _interest_lock:
+            _reload_increments = None
+        raise
+
+    # Increments not in Mongo yet, plus those recorded during the build
+    with _interest_lock:
+        snapshot.add_interest(unflushed)
+        snapshot.add_interest(_reload_increments)
+        _reload_increments = None
+        _version = snapshot.version
+        _snapshot = snapshot
+    print(f"📚 College catalog v{_version} loaded ({len(docs)} colleges)")
@@ -0,0 +1,118 @@
+# Backend/services/college_fields.py
+#
+# Parsing helpers for the loosely-typed College fields (rating, reviews,
+# NIRF rank, region). Shared by the routes, the catalog snapshot and the
+# ingest script, which stores the numeric versions on each document so the
+# directory can sort and filter on indexes.
+
+import re
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+NAGPUR = "nagpur"
+UNRANKED_NIRF = 999999
+
+
+def college_oid(college_id):
+    """College _id from its string form (ObjectId, or the raw string for legacy ids)."""
+    return ObjectId(college_id) if ObjectId.is_valid(college_id) else college_id
+
+
+def parse_rating(val):
+    """Parse rating to float, handling strings like '4.5' or null/None."""
+    if val is None:
+        return 0.0
+    if isinstance(val, (int, float)):
+        return float(val)
+    if isinstance(val, str):
+        # Extract numeric part, e.g., "4.5" or "4.5/5"
+        match = re.search(r'(\d+(?:\.\d+)?)', val)
+        return float(match.group(1)) if match else 0.0
+    return 0.0
+
+
+def parse_reviews_count(val):
+    """Parse reviews_count to int, handling strings like '38 Student Reviews' or '5 reviews' or null/None."""
+    if val is None:
+        return 0
+    if isinstance(val, int):
+        return val
+    if isinstance(val, str):
+        # Extract numeric part, e.g., "38 Student Reviews" → 38
+        match = re.search(r'(\d+)', val)
+        return int(match.group(1)) if match else 0
+    return 0
+
+
+def parse_nirf_rank(val):
+    """Parse nirf_rank to int or None."""
+    if val is None:
+        return None
+    if isinstance(val, int):
+        return val
+    if isinstance(val, str):
+        match = re.search(r'\d+', val)
+        return int(match.group()) if match else None
+    return None
+
+
+def parse_interest(val):
+    """Parse interest counter to int (missing/null → 0)."""
+    try:
+        return int(val or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_nagpur_college(doc):
+    """Same rule the directory uses: district, NIRF city or name mentions Nagpur."""
+    return (
+        (doc.get("district") or "").lower() == NAGPUR
+        or (doc.get("nirf_city") or "").lower() == NAGPUR
+        or NAGPUR in (doc.get("name") or "").lower()
+    )
+
+
+# Fields materialize_sort_fields() derives from; a write touching any of
+# them has to recompute the materialized values.
+SORT_SOURCE_FIELDS = ("name", "district", "nirf_city", "nirf_rank", "reviews_count", "rating", "image_url")
+
+# Compound indexes backing the directory sorts (see routes/colleges.py).
+# Every directory query filters on has_image, so it leads each key; _id
+# closes each key because the sorts (and keyset cursors) end on it.
+COLLEGE_INDEXES = [
+    [("has_image", 1), ("is_nagpur", -1), ("nirf_rank_num", 1), ("reviews_num", -1), ("rating_num", -1), ("_id", 1)],
+    [("has_image", 1), ("interest", -1), ("rating_num", -1), ("nirf_rank_num", 1), ("_id", 1)],
+    [("has_image", 1), ("rating_num", -1), ("_id", 1)],
+    [("has_image", 1), ("nirf_rank_num", 1), ("_id", 1)],
+    [("has_image", 1), ("year_established", -1), ("_id", 1)],
+]
+
+
+def materialize_sort_fields(doc):
+    """Numeric fields the directory sorts and filters on, stored on the document."""
+    nirf_rank = parse_nirf_rank(doc.get("nirf_rank"))
+    return {
+        "has_image": bool(doc.get("image_url")),
+        "is_nagpur": is_nagpur_college(doc),
+        "nirf_rank_num": nirf_rank if nirf_rank is not None else UNRANKED_NIRF,
+        "reviews_num": parse_reviews_count(doc.get("reviews_count")),
+        "rating_num": parse_rating(doc.get("rating")),
+    }
+
+
+def ensure_college_indexes(collection):
+    for keys in COLLEGE_INDEXES:
+        collection.create_index(keys)
+
+
+def rematerialize(collection, ids):
+    """Recompute the stored sort fields for the given College _ids."""
+    ops = [
+        UpdateOne({"_id": doc["_id"]}, {"$set": materialize_sort_fields(doc)})
+        for doc in collection.find({"_id": {"$in": list(ids)}}, {f: 1 for f in SORT_SOURCE_FIELDS})
+    ]
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    return len(ops)
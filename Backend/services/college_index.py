@@ -0,0 +1,136 @@
+# Backend/services/college_index.py
+#
+# Inverted index over College courses and columnar ranking data, built once
+# per catalog snapshot. Postings are (college_pos, course_pos) pairs pointing
+# into CatalogSnapshot.colleges and that college's "courses" array.
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from services.college_fields import NAGPUR, parse_nirf_rank, parse_rating, parse_reviews_count
+from services.degree_taxonomy import degree_code
+from services.spec_matcher import SPEC_SEPARATOR, SpecMatcher
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def spec_tokens(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class CourseIndex:
+    """
+    - by_degree: canonical degree code (see degree_taxonomy) -> postings
+      offering that degree
+    - by_token: specialization token (lower-cased) -> postings
+    - open_postings: short_name -> postings whose course lists no
+      specializations (these match any requested specialization)
+    - course_specs: posting -> its lower-cased specializations joined by
+      SPEC_SEPARATOR, ready for SpecMatcher.search
+    """
+
+    def __init__(self, colleges):
+        self.by_degree = defaultdict(list)
+        self.by_token = defaultdict(set)
+        self.open_postings = defaultdict(set)
+        self.course_specs = {}
+
+        for college_pos, college in enumerate(colleges):
+            for course_pos, course in enumerate(college.get("courses") or []):
+                short_name = course.get("short_name")
+                if not isinstance(short_name, str) or not short_name:
+                    continue
+                # Canonical code stored at ingest; older documents are mapped here
+                short_name = course.get("degree_code") or degree_code(short_name)
+                posting = (college_pos, course_pos)
+
+                self.by_degree[short_name].append(posting)
+                specs = [s.lower() for s in (course.get("specializations") or []) if s]
+                self.course_specs[posting] = SPEC_SEPARATOR.join(specs)
+                if not specs:
+                    self.open_postings[short_name].add(posting)
+                for spec in specs:
+                    for token in spec_tokens(spec):
+                        self.by_token[token].add(posting)
+
+        self.degree_postings = {k: set(v) for k, v in self.by_degree.items()}
+        # Sorted vocabulary for prefix lookups ("electronic" -> "electronics")
+        self.vocabulary = sorted(self.by_token)
+
+    def _tokens_with_prefix(self, prefix):
+        i = bisect_left(self.vocabulary, prefix)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix):
+            yield self.vocabulary[i]
+            i += 1
+
+    def lookup(self, short_name, quiz_specs):
+        """
+        Postings for `short_name` courses matching any of `quiz_specs`, in
+        catalog order. A quiz spec matches when it is a case-insensitive
+        substring of one of the course's specializations; candidates come
+        from the token index, so the substring has to start at a word.
+        """
+        postings = self.by_degree.get(short_name)
+        if not postings:
+            return []
+        quiz_specs = [s.lower() for s in quiz_specs or [] if s]
+        if not quiz_specs:
+            return postings  # If no specs, consider match
+
+        degree_postings = self.degree_postings[short_name]
+        candidates = set()
+        for q_spec in quiz_specs:
+            tokens = spec_tokens(q_spec)
+            if not tokens:
+                # Nothing to look up (e.g. "&"), check every course of the degree
+                candidates = degree_postings
+                break
+            for token in self._tokens_with_prefix(tokens[0]):
+                candidates |= self.by_token[token] & degree_postings
+
+        matcher = SpecMatcher(quiz_specs)
+        matched = set(self.open_postings[short_name])
+        for posting in candidates:
+            if matcher.search(self.course_specs[posting]):
+                matched.add(posting)
+        return sorted(matched)
+
+
+class CollegeRanking:
+    """
+    Columnar ranking data for recommendations. The sort key (NIRF rank asc
+    with unranked last, reviews desc, rating desc, then catalog order) does
+    not depend on the request, so every college's position in that order
+    is computed once here; picking the best k of a match set is then an
+    argpartition over those positions.
+    """
+
+    def __init__(self, colleges):
+        nirf_rank = np.array([
+            rank if rank is not None else np.inf
+            for rank in (parse_nirf_rank(c.get("nirf_rank")) for c in colleges)
+        ], dtype=np.float64)
+        reviews = np.array([parse_reviews_count(c.get("reviews_count")) for c in colleges], dtype=np.int64)
+        rating = np.array([parse_rating(c.get("rating")) for c in colleges], dtype=np.float64)
+        # Recommendations split on district / NIRF city only (not the name)
+        self.is_nagpur = np.array([
+            (c.get("district") or "").lower() == NAGPUR or (c.get("nirf_city") or "").lower() == NAGPUR
+            for c in colleges
+        ], dtype=bool)
+
+        # lexsort: last key is the primary one
+        order = np.lexsort((np.arange(len(colleges)), -rating, -reviews, nirf_rank))
+        self.position = np.empty(len(colleges), dtype=np.int64)
+        self.position[order] = np.arange(len(colleges))
+
+    def top(self, college_positions, k):
+        """The best k of `college_positions`, best first, in O(n + k log k)."""
+        candidates = np.asarray(college_positions, dtype=np.int64)
+        if k <= 0 or candidates.size == 0:
+            return candidates[:0]
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(self.position[candidates], k - 1)[:k]]
+        return candidates[np.argsort(self.position[candidates])]
@@ -0,0 +1,144 @@
+# Backend/services/content_fields.py
+#
+# Derived fields stored on Content documents at write time, so
+# /content/streams can find matching items with one indexed $in query
+# instead of normalizing every title and tag on every request.
+
+import math
+
+from services.degree_taxonomy import degree_codes, normalize_label
+
+# Prefixes shorter than this would match nearly everything ("b" → btech, ba, bsc, ...)
+MIN_PREFIX_LEN = 2
+# Longer requested streams still match; they just aren't stored as prefixes
+MAX_PREFIX_LEN = 32
+
+# Index-only fields left out of API responses
+HIDDEN_FIELDS = {"search_tokens": 0, "tags_norm": 0}
+
+# Multikey indexes behind POST /content/streams, then the "recent" /
+# "top rated" / "most downloaded" sorts of /content/all
+CONTENT_INDEXES = [
+    [("search_tokens", 1)],
+    [("tags_norm", 1)],
+    [("created_at", -1), ("_id", -1)],
+    [("rating", -1), ("_id", -1)],
+    [("downloads", -1), ("_id", -1)],
+]
+
+
+# Imported dumps carry Extended JSON: {"$numberDouble": "4.5"}, {"$numberLong": "1200"}, ...
+NUMBER_WRAPPERS = ("$numberInt", "$numberLong", "$numberDouble", "$numberDecimal")
+
+# Marks a value the parsers couldn't read (None is a legitimate stored value)
+UNPARSEABLE = object()
+
+
+def _unwrap(value):
+    if isinstance(value, dict) and len(value) == 1:
+        wrapper, inner = next(iter(value.items()))
+        if wrapper in NUMBER_WRAPPERS:
+            return inner
+    return value
+
+
+def _number(value):
+    value = _unwrap(value)
+    if isinstance(value, bool):
+        return UNPARSEABLE
+    if isinstance(value, str):
+        value = value.strip().replace(",", "")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return UNPARSEABLE
+    return number if math.isfinite(number) else UNPARSEABLE
+
+
+def parse_content_rating(value):
+    """rating as a float (None stays None); UNPARSEABLE otherwise."""
+    if value is None:
+        return None
+    return _number(value)
+
+
+def parse_content_downloads(value):
+    """downloads as an int (None stays None); UNPARSEABLE otherwise."""
+    if value is None:
+        return None
+    number = _number(value)
+    return number if number is UNPARSEABLE else int(number)
+
+
+def typed_content_fields(doc):
+    """
+    (fields, unparsed): rating/downloads as real numbers for the keys the
+    document has, and the names of fields left out because their value
+    couldn't be read, so callers keep the original instead of losing it.
+    """
+    fields = {}
+    unparsed = []
+    for key, parse in (("rating", parse_content_rating), ("downloads", parse_content_downloads)):
+        if key not in doc:
+            continue
+        value = parse(doc[key])
+        if value is UNPARSEABLE:
+            unparsed.append(key)
+        else:
+            fields[key] = value
+    return fields, unparsed
+
+
+def _prefixes(token):
+    return {token[:n] for n in range(MIN_PREFIX_LEN, min(len(token), MAX_PREFIX_LEN) + 1)}
+
+
+def content_search_fields(doc):
+    """
+    - tags_norm: normalized tags ("B.Tech" -> "btech")
+    - search_tokens: every prefix of the normalized tags, title words and
+      whole title, plus the lower-cased canonical degree codes
+    - degree_codes: canonical degree codes from the title and tags
+    """
+    title = doc.get("title") or ""
+    tags = [t for t in (doc.get("tags") or []) if t is not None]
+    tags_norm = sorted({normalize_label(t) for t in tags} - {""})
+    codes = degree_codes([title] + tags)
+
+    tokens = set()
+    for token in tags_norm + [normalize_label(w) for w in str(title).split()] + [normalize_label(title)]:
+        tokens |= _prefixes(token)
+    tokens.update(code.lower() for code in codes)
+
+    return {
+        "tags_norm": tags_norm,
+        "search_tokens": sorted(tokens),
+        "degree_codes": codes,
+    }
+
+
+def stream_query(recs):
+    """
+    Mongo filter for content matching any requested stream: a rec matches
+    when it is a prefix of a tag / title word / the title, names the same
+    canonical degree, or a tag is a prefix of the rec ("btechcse" → "btech").
+    """
+    rec_tokens = set()
+    tag_prefixes = set()
+    for rec in recs:
+        norm = normalize_label(rec)
+        if not norm:
+            continue
+        rec_tokens.add(norm)
+        tag_prefixes |= _prefixes(norm) | {norm}
+    rec_tokens.update(code.lower() for code in degree_codes(recs))
+
+    return {"$or": [
+        {"search_tokens": {"$in": sorted(rec_tokens)}},
+        {"tags_norm": {"$in": sorted(tag_prefixes)}},
+    ]}
+
+
+def ensure_content_indexes(collection):
+    for keys in CONTENT_INDEXES:
+        collection.create_index(keys)
@@ -0,0 +1,78 @@
+# Backend/services/date_ranges.py
+#
+# Parses the free-text event dates in the timeline data into a concrete
+# [start, end] range of days, e.g.
+#   "2026-03-27 to 2026-03-29"      → 2026-03-27 .. 2026-03-29
+#   "January 21-30, 2026"           → 2026-01-21 .. 2026-01-30
+#   "April 28 - May 3, 2026"        → 2026-04-28 .. 2026-05-03
+#   "December 2025 - January 2026"  → 2025-12-01 .. 2026-01-31
+#   "March - June 2026"             → 2026-03-01 .. 2026-06-30
+# A side without a day covers its whole month; a missing month or year is
+# taken from the other side.
+
+import calendar
+import re
+from datetime import datetime
+
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_SIDE_SPLIT_RE = re.compile(r"\s*(?:\bto\b|–|—|-)\s*", re.IGNORECASE)
+_YEAR_RE = re.compile(r"\b(\d{4})\b")
+_DAY_RE = re.compile(r"\b(\d{1,2})\b")
+_MONTH_RE = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?", re.IGNORECASE)
+
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+
+
+def _parse_side(text):
+    """(year, month, day), any of them None."""
+    month = _MONTH_RE.search(text)
+    year = _YEAR_RE.search(text)
+    rest = _YEAR_RE.sub(" ", text)
+    day = _DAY_RE.search(rest)
+    return (
+        int(year.group(1)) if year else None,
+        _MONTHS[month.group(1).lower()] if month else None,
+        int(day.group(1)) if day else None,
+    )
+
+
+def _to_date(year, month, day, end):
+    if day is None:
+        day = calendar.monthrange(year, month)[1] if end else 1
+    return datetime(year, month, day)
+
+
+def parse_date_range(text):
+    """(start, end) datetimes at midnight, or (None, None) if `text` has no usable date."""
+    if not text or not isinstance(text, str):
+        return None, None
+
+    iso = _ISO_RE.findall(text)
+    if iso:
+        try:
+            dates = [datetime.strptime(d, "%Y-%m-%d") for d in iso]
+        except ValueError:
+            return None, None
+        return dates[0], dates[-1]
+
+    sides = [s for s in _SIDE_SPLIT_RE.split(text.strip()) if s]
+    if not sides:
+        return None, None
+    first, last = _parse_side(sides[0]), _parse_side(sides[-1])
+
+    # Fill the gaps from the other side: "April 2-10, 2026", "March - June 2026"
+    year_start = first[0] or last[0]
+    year_end = last[0] or first[0]
+    month_start = first[1] or last[1]
+    month_end = last[1] or first[1]
+    if not (year_start and month_start):
+        return None, None
+
+    try:
+        start = _to_date(year_start, month_start, first[2], end=False)
+        end = _to_date(year_end, month_end, last[2], end=True)
+    except ValueError:
+        return None, None
+    if end < start:
+        return start, start
+    return start, end
@@ -0,0 +1,124 @@
+# Backend/services/degree_taxonomy.py
+#
+# One place that knows how degrees are spelled. Every alias ("B.Tech",
+# "BTech", "Bachelor of Technology", "B.Tech in Civil", ...) resolves to a
+# canonical code ("BTECH") through a precomputed dict, so matching degrees
+# across colleges, content, exams and quiz output is a hash lookup.
+# Canonical codes are stored at ingest (courses[].degree_code,
+# Content.degree_codes, exam degree_codes).
+
+import re
+
+# canonical code -> aliases (the code itself is always an alias)
+DEGREE_ALIASES = {
+    "BTECH": ["B.Tech", "B Tech", "B.Tech.", "Bachelor of Technology"],
+    "BE": ["B.E.", "Bachelor of Engineering"],
+    "BARCH": ["B.Arch", "Bachelor of Architecture"],
+    "BPLAN": ["B.Plan", "Bachelor of Planning"],
+    "BSC": ["B.Sc", "B.Sc.", "Bachelor of Science"],
+    "BSCNURSING": ["B.Sc Nursing", "BSC_NURSING", "Bachelor of Science in Nursing"],
+    "BCOM": ["B.Com", "B.Com.", "Bachelor of Commerce"],
+    "BA": ["B.A.", "Bachelor of Arts"],
+    "BBA": ["B.B.A.", "Bachelor of Business Administration"],
+    "BMS": ["Bachelor of Management Studies"],
+    "BCA": ["B.C.A.", "Bachelor of Computer Applications"],
+    "BDES": ["B.Des", "B.Design", "Bachelor of Design"],
+    "BPHARM": ["B.Pharm", "B.Pharma", "Bachelor of Pharmacy"],
+    "BED": ["B.Ed", "Bachelor of Education"],
+    "BPED": ["B.P.Ed", "Bachelor of Physical Education"],
+    "BHMCT": ["Bachelor of Hotel Management and Catering Technology"],
+    "BFA": ["B.F.A.", "Bachelor of Fine Arts"],
+    "BJMC": ["B.J.M.C.", "Bachelor of Journalism and Mass Communication", "BJ", "B.J.", "Bachelor of Journalism"],
+    "BSW": ["B.S.W.", "Bachelor of Social Work", "Bachelors of Social Work"],
+    "LLB": ["LL.B", "Bachelor of Laws"],
+    "BALLB": ["BA LLB", "B.A. LL.B", "BA_LLB"],
+    "MBBS": ["M.B.B.S."],
+    "BDS": ["Bachelor of Dental Surgery"],
+    "BAMS": ["Bachelor of Ayurvedic Medicine and Surgery"],
+    "MTECH": ["M.Tech", "Master of Technology"],
+    "MSC": ["M.Sc", "M.Sc.", "Master of Science"],
+    "MA": ["M.A.", "Master of Arts"],
+    "MCOM": ["M.Com", "Master of Commerce"],
+    "MBA": ["M.B.A.", "MBA/PGDM", "Master of Business Administration"],
+    "MCA": ["M.C.A.", "Master of Computer Applications"],
+    "MDES": ["M.Des", "Master of Design"],
+    "MFA": ["M.F.A.", "Master of Fine Arts"],
+    "MSW": ["M.S.W.", "Master of Social Work"],
+    "MED": ["M.Ed", "Master of Education"],
+    "MPED": ["M.P.Ed", "Master of Physical Education"],
+    "PHD": ["Ph.D", "Ph.D.", "Doctor of Philosophy"],
+}
+
+# Qualifiers after the degree itself: "B.Tech in Civil", "B.Sc (Hons)", "BBA - Finance",
+# and alternatives after a slash: "B.Tech/B.E." (whole-label aliases like "MBA/PGDM" win first)
+_QUALIFIER_RE = re.compile(r"\s+(?:in|with)\s+|\s*[(\[:,/–-]", re.IGNORECASE)
+# Scraped short_names sometimes carry parsing debris: "B(A", "DP[", "B{"
+_MALFORMED_RE = re.compile(r"[()\[\]{}:+]")
+
+
+def normalize_label(value):
+    """Lower-case alphanumerics only: "B.Tech (CSE)" -> "btechcse"."""
+    if value is None:
+        return None
+    return "".join(ch for ch in str(value).lower() if ch.isalnum())
+
+
+def _alias_key(value):
+    return normalize_label(value).upper()
+
+
+ALIAS_TO_CODE = {}
+for _code, _aliases in DEGREE_ALIASES.items():
+    for _alias in [_code] + _aliases:
+        ALIAS_TO_CODE[_alias_key(_alias)] = _code
+
+
+def canonical_degree(label, default=None):
+    """
+    Canonical code for a degree label, or `default` if it isn't a known
+    degree. Tries the whole label, then the label without its qualifier,
+    then shorter leading word runs ("B.Tech Computer Science" -> "BTECH").
+    """
+    if not label or not isinstance(label, str):
+        return default
+    code = ALIAS_TO_CODE.get(_alias_key(label))
+    if code:
+        return code
+
+    words = _QUALIFIER_RE.split(label, maxsplit=1)[0].split()
+    for n in range(len(words), 0, -1):
+        code = ALIAS_TO_CODE.get(_alias_key(" ".join(words[:n])))
+        if code:
+            return code
+    return default
+
+
+def degree_code(short_name):
+    """
+    Stored code for a course/exam short_name. Only whole-name aliases count
+    ("BPHARMA" -> "BPHARM"); unknown or malformed names ("B(A") keep their
+    upper-cased spelling so they never collide with a real degree.
+    """
+    if not short_name or not isinstance(short_name, str):
+        return None
+    if _MALFORMED_RE.search(short_name):
+        return short_name.upper()
+    return ALIAS_TO_CODE.get(_alias_key(short_name), short_name.upper())
+
+
+def degree_codes(labels):
+    """Distinct canonical codes found in a list of labels, in order."""
+    codes = []
+    for label in labels or []:
+        code = canonical_degree(label)
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def tag_course_codes(courses):
+    """Set degree_code on each course dict in place; returns the list."""
+    for course in courses or []:
+        if isinstance(course, dict):
+            course["degree_code"] = degree_code(course.get("short_name"))
+    return courses
@@ -0,0 +1,123 @@
+# Backend/services/interest_buffer.py
+#
+# Write-behind buffer for College interest counters. /colleges/interest-batch
+# is hit by sendBeacon on every page unload; instead of one $inc per college
+# per request, increments are merged in memory and flushed periodically as
+# a single unordered bulk_write.
+
+import atexit
+import os
+import threading
+import time
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.connectDB import connect_db
+from services.college_fields import college_oid
+
+INTEREST_FLUSH_SECONDS = float(os.getenv("INTEREST_FLUSH_SECONDS", "5"))
+# Distinct colleges held between flushes; increments for new ids beyond
+# this are dropped (and counted as lost) rather than growing without bound.
+INTEREST_MAX_PENDING = int(os.getenv("INTEREST_MAX_PENDING", "10000"))
+
+
+class InterestBuffer:
+    def __init__(self, flush_seconds=INTEREST_FLUSH_SECONDS, max_pending=INTEREST_MAX_PENDING):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Held for a whole flush; the catalog takes it to read Mongo and
+        # pending_increments() consistently
+        self.flush_lock = threading.Lock()
+        self._thread = None
+        self.stats = {
+            "accepted": 0,        # increments taken from requests
+            "flushed": 0,         # increments written to Mongo
+            "lost": 0,            # increments dropped (buffer full / write error)
+            "flushes": 0,
+            "failed_flushes": 0,
+            "last_flush_at": None,
+        }
+
+    def add(self, increments):
+        """Merge {college_id: inc} into the pending batch. Never touches Mongo."""
+        with self._lock:
+            self.stats["accepted"] += sum(increments.values())
+            self._merge(increments)
+        self._ensure_worker()
+
+    def flush(self):
+        """Write everything pending as one unordered bulk_write."""
+        with self.flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            items = list(batch.items())
+            ops = [UpdateOne({"_id": college_oid(cid)}, {"$inc": {"interest": inc}}) for cid, inc in items]
+            try:
+                connect_db().College.bulk_write(ops, ordered=False)
+                failed = set()
+            except BulkWriteError as e:
+                failed = {err["index"] for err in e.details.get("writeErrors", [])}
+            except Exception as e:
+                # Mongo unreachable: put the batch back for the next flush
+                print("❌ Interest flush failed, will retry:", e)
+                with self._lock:
+                    self.stats["failed_flushes"] += 1
+                    self._merge(batch)
+                return 0
+
+            lost = sum(items[i][1] for i in failed)
+            with self._lock:
+                self.stats["lost"] += lost
+                self.stats["flushed"] += sum(inc for _, inc in items) - lost
+                self.stats["flushes"] += 1
+                self.stats["last_flush_at"] = time.time()
+            return len(ops)
+
+    def pending_increments(self):
+        """Copy of {college_id: inc} not yet written to Mongo."""
+        with self._lock:
+            return dict(self._pending)
+
+    def _merge(self, increments):
+        # Caller holds self._lock
+        for college_id, inc in increments.items():
+            if college_id not in self._pending and len(self._pending) >= self.max_pending:
+                self.stats["lost"] += inc
+                continue
+            self._pending[college_id] = self._pending.get(college_id, 0) + inc
+
+    def snapshot_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending_colleges"] = len(self._pending)
+            stats["pending_increments"] = sum(self._pending.values())
+        stats["flush_seconds"] = self.flush_seconds
+        return stats
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="interest-flush", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                print("❌ Interest flush worker error:", e)
+
+
+interest_buffer = InterestBuffer()
+
+# Don't drop the last few seconds of increments on shutdown
+atexit.register(interest_buffer.flush)
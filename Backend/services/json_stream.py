@@ -0,0 +1,64 @@
+# Backend/services/json_stream.py
+#
+# Incremental reader for LLM JSON output arriving in chunks. ArrayItemStream
+# watches for `"<key>": [` and hands back each element of that array as soon
+# as its closing brace arrives, so callers can forward items while the model
+# is still writing the rest.
+
+import json
+import re
+
+
+class ArrayItemStream:
+    def __init__(self, key):
+        self._key_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buf = ""
+        self._pos = 0           # next unscanned index into _buf
+        self._in_array = False
+        self._depth = 0         # {/[ nesting inside the array
+        self._start = None      # index where the current item began
+        self._in_string = False
+        self._escape = False
+        self.done = False       # saw the array's closing bracket
+
+    def feed(self, chunk):
+        """Append `chunk`; returns the array items completed by it."""
+        self._buf += chunk
+        items = []
+        if not self._in_array and not self.done:
+            match = self._key_re.search(self._buf)
+            if not match:
+                return items
+            self._in_array = True
+            self._pos = match.end()
+
+        while self._in_array and self._pos < len(self._buf):
+            ch = self._buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._start = self._pos
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # "]" closing the array itself
+                    self._in_array = False
+                    self.done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        try:
+                            items.append(json.loads(self._buf[self._start:self._pos + 1]))
+                        except ValueError:
+                            pass  # malformed item: skip it, keep reading
+                        self._start = None
+            self._pos += 1
+        return items
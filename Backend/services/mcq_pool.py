@@ -0,0 +1,118 @@
+# Backend/services/mcq_pool.py
+#
+# Pre-generated MCQ sets for /quiz/generate-mcq, keyed by a student's
+# dominant RIASEC signature (top-2 traits by default, e.g. "IR"). A request
+# takes a ready set from the pool; when a signature drops below the low
+# watermark a background worker refills it up to the target. Sets older
+# than MCQ_POOL_MAX_AGE_SECONDS are dropped instead of served.
+
+import os
+import threading
+import time
+from collections import deque
+
+MCQ_POOL_SIGNATURE_LEN = int(os.getenv("MCQ_POOL_SIGNATURE_LEN", "2"))
+MCQ_POOL_SET_SIZE = int(os.getenv("MCQ_POOL_SET_SIZE", "5"))
+MCQ_POOL_LOW_WATERMARK = int(os.getenv("MCQ_POOL_LOW_WATERMARK", "2"))
+MCQ_POOL_TARGET = int(os.getenv("MCQ_POOL_TARGET", "5"))
+MCQ_POOL_MAX_AGE_SECONDS = int(os.getenv("MCQ_POOL_MAX_AGE_SECONDS", str(24 * 3600)))
+# Pause after a failed generation before the worker tries again
+MCQ_POOL_RETRY_SECONDS = float(os.getenv("MCQ_POOL_RETRY_SECONDS", "30"))
+
+
+def validate_mcq_set(questions, size):
+    """True for exactly `size` questions, each with text and non-empty options A-D."""
+    if not isinstance(questions, list) or len(questions) != size:
+        return False
+    for q in questions:
+        if not isinstance(q, dict) or not isinstance(q.get("question"), str) or not q["question"].strip():
+            return False
+        options = q.get("options")
+        if not isinstance(options, dict):
+            return False
+        if any(not isinstance(options.get(k), str) or not options[k].strip() for k in "ABCD"):
+            return False
+    return True
+
+
+class MCQPool:
+    def __init__(self, generate, set_size=MCQ_POOL_SET_SIZE, low_watermark=MCQ_POOL_LOW_WATERMARK,
+                 target=MCQ_POOL_TARGET, max_age_seconds=MCQ_POOL_MAX_AGE_SECONDS):
+        """generate(signature, set_size) -> list of MCQ dicts (validated here)."""
+        self.generate = generate
+        self.set_size = set_size
+        self.low_watermark = low_watermark
+        self.target = target
+        self.max_age_seconds = max_age_seconds
+        self._sets = {}             # signature -> deque[(created_at, questions)]
+        self._refill = set()        # signatures waiting for the worker
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {"hits": 0, "misses": 0, "generated": 0, "invalid": 0, "failed": 0, "evicted": 0}
+
+    def take(self, signature):
+        """A fresh MCQ set for `signature`, or None on a miss. Schedules a refill when low."""
+        with self._lock:
+            sets = self._sets.setdefault(signature, deque())
+            self._evict_stale(sets)
+            questions = sets.popleft()[1] if sets else None
+            self.stats["hits" if questions else "misses"] += 1
+            if len(sets) < self.low_watermark:
+                self._refill.add(signature)
+                self._wake.set()
+        self._ensure_worker()
+        return questions
+
+    def snapshot_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pooled"] = {sig: len(sets) for sig, sets in self._sets.items()}
+            stats["pending_refills"] = sorted(self._refill)
+        return stats
+
+    def _evict_stale(self, sets):
+        # Caller holds self._lock; sets are appended in creation order
+        cutoff = time.time() - self.max_age_seconds
+        while sets and sets[0][0] < cutoff:
+            sets.popleft()
+            self.stats["evicted"] += 1
+
+    def _fill(self, signature):
+        while True:
+            with self._lock:
+                sets = self._sets.setdefault(signature, deque())
+                self._evict_stale(sets)
+                if len(sets) >= self.target:
+                    return
+            questions = self.generate(signature, self.set_size)
+            with self._lock:
+                if validate_mcq_set(questions, self.set_size):
+                    sets.append((time.time(), questions))
+                    self.stats["generated"] += 1
+                else:
+                    self.stats["invalid"] += 1
+                    return  # try again on the next refill request
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="mcq-pool", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                signatures, self._refill = self._refill, set()
+                self._wake.clear()
+            for signature in signatures:
+                try:
+                    self._fill(signature)
+                except Exception as e:
+                    print(f"❌ MCQ pool refill failed for {signature}:", e)
+                    with self._lock:
+                        self.stats["failed"] += 1
+                    time.sleep(MCQ_POOL_RETRY_SECONDS)
@@ -0,0 +1,43 @@
+# Backend/services/narrative_jobs.py
+#
+# Small background job runner for LLM text that decorates a response that
+# has already been sent (e.g. narrative "reason" text for locally scored
+# career recommendations). Results are kept in a TTL'd LRU and polled by id.
+
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from services.lru_cache import LRUCache
+
+NARRATIVE_WORKERS = int(os.getenv("NARRATIVE_WORKERS", "2"))
+# Matches QUIZ_REC_CACHE_TTL_SECONDS so cached narrative ids stay pollable
+NARRATIVE_TTL_SECONDS = int(os.getenv("NARRATIVE_TTL_SECONDS", str(6 * 3600)))
+
+
+class NarrativeJobs:
+    def __init__(self, workers=NARRATIVE_WORKERS, ttl_seconds=NARRATIVE_TTL_SECONDS, max_size=5000):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narrative")
+        self._results = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in the background; returns the job id to poll."""
+        job_id = uuid.uuid4().hex
+        self._results.put(job_id, {"status": "pending"})
+
+        def run():
+            try:
+                self._results.put(job_id, {"status": "done", "result": fn(*args)})
+            except Exception as e:
+                print("❌ Narrative job failed:", e)
+                self._results.put(job_id, {"status": "error", "message": str(e)})
+
+        self._pool.submit(run)
+        return job_id
+
+    def get(self, job_id):
+        """{"status": pending|done|error, ...} or None for an unknown/expired id."""
+        return self._results.get(job_id)
+
+
+narrative_jobs = NarrativeJobs()
@@ -0,0 +1,64 @@
+# Backend/services/ndjson.py
+#
+# Streaming NDJSON export: one JSON document per line, written straight
+# from a Mongo cursor as Flask iterates the response, so memory stays flat
+# and the first line goes out as soon as the first batch arrives.
+
+import json
+import os
+
+from flask import Response, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+DEFAULT_STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+MAX_STREAM_BATCH_SIZE = 5000
+
+
+def wants_ndjson(req):
+    """True for ?stream=1 or an explicit Accept: application/x-ndjson."""
+    if req.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return True
+    # Not accept_mimetypes: a browser's */* would match too
+    return NDJSON_MIMETYPE in req.headers.get("Accept", "")
+
+
+def read_ndjson(req):
+    """Parsed lines of an NDJSON request body; raises ValueError on a bad line."""
+    rows = []
+    for line_no, line in enumerate(req.get_data(as_text=True).splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            raise ValueError(f"Invalid JSON on line {line_no}")
+    return rows
+
+
+def parse_batch_size(args):
+    """?batch_size= for the cursor, clamped; raises ValueError if not a number."""
+    raw = args.get("batch_size")
+    if raw is None:
+        return DEFAULT_STREAM_BATCH_SIZE
+    try:
+        batch_size = int(raw)
+    except ValueError:
+        raise ValueError("batch_size must be an integer")
+    return max(1, min(batch_size, MAX_STREAM_BATCH_SIZE))
+
+
+def ndjson_response(cursor, serialize=None):
+    """Stream `serialize(doc)` for each document of `cursor` (or any iterable) as NDJSON."""
+
+    def generate():
+        try:
+            for doc in cursor:
+                row = serialize(doc) if serialize else doc
+                yield json.dumps(row, default=str, separators=(",", ":")) + "\n"
+        finally:
+            # Client went away or we finished: release the server-side cursor
+            if hasattr(cursor, "close"):
+                cursor.close()
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
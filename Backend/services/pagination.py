@@ -0,0 +1,103 @@
+# Backend/services/pagination.py
+#
+# Keyset (cursor) pagination helpers. A cursor is the sort-key values of the
+# last row of a page, so fetching page N is one index range scan, the same
+# cost as page 1, instead of a skip over everything before it.
+
+import base64
+
+from bson import json_util
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_name, doc, sort):
+    """Opaque cursor pointing just after `doc` in the given sort."""
+    values = [_get_path(doc, field) for field, _ in sort]
+    raw = json_util.dumps({"s": sort_name, "v": values})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort_name, sort):
+    """Sort-key values from a cursor; it must come from the same sort."""
+    try:
+        data = json_util.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(data, dict) or data.get("s") != sort_name or len(data.get("v") or []) != len(sort):
+        raise InvalidCursor("Cursor does not belong to this sort order")
+    return data["v"]
+
+
+def keyset_filter(sort, values):
+    """
+    Mongo filter for rows strictly after `values` in `sort`, e.g. for
+    [(a, -1), (b, 1)]: a < va OR (a == va AND b > vb).
+    Nulls sort lowest, which $gt/$lt don't see: a descending key also
+    takes the null rows after it, and nothing comes after null there.
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        value = values[i]
+        if value is None:
+            if direction == -1:
+                continue
+            clause[field] = {"$ne": None}
+        elif direction == 1:
+            clause[field] = {"$gt": value}
+        else:
+            clause["$or"] = [{field: {"$lt": value}}, {field: None}]
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def parse_page_args(args):
+    """
+    (limit, cursor) from query args. limit is None when the caller asked
+    for neither, which keeps the old single-response behaviour.
+    """
+    limit = args.get("limit")
+    cursor = args.get("cursor") or None
+    if limit is None and cursor is None:
+        return None, None
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_LIMIT
+    except ValueError:
+        limit = DEFAULT_PAGE_LIMIT
+    return max(1, min(limit, MAX_PAGE_LIMIT)), cursor
+
+
+def fetch_page(collection, query, projection, sort_name, sort, limit, cursor):
+    """
+    One page of `collection` in `sort` order (sort must end in a unique
+    field, normally _id). Returns (docs, next_cursor).
+    """
+    if cursor:
+        after = keyset_filter(sort, decode_cursor(cursor, sort_name, sort))
+        query = {"$and": [query, after]} if query else after
+
+    projection = dict(projection or {})
+    # An inclusion projection needs the sort keys to build the cursor;
+    # an exclusion one (or none) returns them anyway
+    if any(v for k, v in projection.items() if k != "_id"):
+        for field, _ in sort:
+            projection.setdefault(field, 1)
+
+    docs = list(collection.find(query, projection or None).sort(sort).limit(limit + 1))
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(sort_name, docs[-1], sort)
+    return docs, next_cursor
+
+
+def _get_path(doc, field):
+    for part in field.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
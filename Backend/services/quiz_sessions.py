@@ -0,0 +1,87 @@
+# Backend/services/quiz_sessions.py
+#
+# Server-side state for the adaptive RIASEC quiz, so the client only sends
+# a session id and its latest answer. A session holds one "asked" bitset
+# per trait (bit i = question id trait_base + i) and the answers so far.
+#
+# QUIZ_SESSION_STORE=mongo (default) keeps sessions in the quiz_sessions
+# collection with a TTL index; =memory keeps them in-process (single
+# worker / local dev).
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from services.connectDB import connect_db
+
+QUIZ_SESSION_TTL_SECONDS = int(os.getenv("QUIZ_SESSION_TTL_SECONDS", str(2 * 3600)))
+QUIZ_SESSION_STORE = os.getenv("QUIZ_SESSION_STORE", "mongo")
+QUIZ_SESSIONS_COLLECTION = "quiz_sessions"
+
+
+def new_session(traits):
+    return {
+        "_id": uuid.uuid4().hex,
+        "asked": {t: 0 for t in traits},   # per-trait bitset of asked question offsets
+        "answers": [],                      # [{"id", "trait", "rating"}]
+        "mcq_answers": [],
+        "pending": None,                    # id of the question last handed out
+    }
+
+
+class MemoryQuizSessionStore:
+    def __init__(self, ttl_seconds=QUIZ_SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._sessions = {}   # id -> (expires_at, session)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._sessions[session_id]
+                return None
+            return entry[1]
+
+    def save(self, session):
+        with self._lock:
+            self._sessions[session["_id"]] = (time.time() + self.ttl_seconds, session)
+            # Opportunistic sweep so abandoned sessions don't pile up
+            if len(self._sessions) % 256 == 0:
+                now = time.time()
+                for sid in [s for s, (exp, _) in self._sessions.items() if exp < now]:
+                    del self._sessions[sid]
+
+
+class MongoQuizSessionStore:
+    def __init__(self, ttl_seconds=QUIZ_SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._indexed = False
+
+    def _collection(self):
+        collection = connect_db()[QUIZ_SESSIONS_COLLECTION]
+        if not self._indexed:
+            # Mongo drops a session ttl_seconds after its last write
+            collection.create_index("updated_at", expireAfterSeconds=self.ttl_seconds)
+            self._indexed = True
+        return collection
+
+    def get(self, session_id):
+        return self._collection().find_one({"_id": session_id})
+
+    def save(self, session):
+        session["updated_at"] = datetime.utcnow()
+        self._collection().replace_one({"_id": session["_id"]}, session, upsert=True)
+
+
+def _make_store():
+    if QUIZ_SESSION_STORE == "memory":
+        return MemoryQuizSessionStore()
+    return MongoQuizSessionStore()
+
+
+quiz_session_store = _make_store()
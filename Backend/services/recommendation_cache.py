@@ -0,0 +1,44 @@
+# Backend/services/recommendation_cache.py
+#
+# Per-student cache for /colleges/recommend/<user_id>. An entry is keyed by
+# user_id and only served while its fingerprint (the student's requested
+# degrees/specializations + the catalog version) still matches, so a new
+# quiz result or a College write makes it miss without explicit cleanup.
+
+import hashlib
+import json
+import os
+
+from services.lru_cache import LRUCache
+
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "5000"))
+
+
+def recommendation_fingerprint(all_degrees, catalog_version):
+    """Stable hash of {short_name: [specs]} plus the catalog version."""
+    canonical = sorted((short_name, sorted(set(s for s in specs if s))) for short_name, specs in all_degrees.items())
+    raw = json.dumps([catalog_version, canonical], separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class RecommendationCache:
+    """user_id -> (fingerprint, response body), stored in an LRUCache."""
+
+    def __init__(self, max_size=RECOMMENDATION_CACHE_SIZE):
+        self._cache = LRUCache(max_size=max_size)
+
+    def get(self, user_id, fingerprint):
+        entry = self._cache.get(user_id, accept=lambda e: e[0] == fingerprint)
+        return entry[1] if entry is not None else None
+
+    def put(self, user_id, fingerprint, body):
+        self._cache.put(user_id, (fingerprint, body))
+
+    def invalidate(self, user_id):
+        self._cache.delete(user_id)
+
+    def stats(self):
+        return self._cache.stats()
+
+
+recommendation_cache = RecommendationCache()
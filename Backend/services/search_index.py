@@ -0,0 +1,92 @@
+# Backend/services/search_index.py
+#
+# In-process trigram index for the directory search box. Built once per
+# catalog snapshot; supports prefix ("nag" → Nagpur) and typo-tolerant
+# ("nagpr" → Nagpur) matching and ranks results by field-weighted score.
+
+import re
+from collections import defaultdict
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# A query term matches an indexed term when at least this share of the
+# query term's trigrams occur in it (1.0 for exact and prefix matches).
+MIN_SIMILARITY = 0.6
+
+
+def _words(text):
+    return _WORD_RE.findall(str(text).lower()) if text else []
+
+
+def _trigrams(word):
+    # Leading padding only, so a query that is a prefix of a term shares
+    # all of its trigrams with it.
+    padded = "  " + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    docs: list of dicts with an "_id"
+    fields: {field_name: weight}, e.g. {"name": 3, "state": 1}
+    """
+
+    def __init__(self, docs, fields):
+        self.ids = [d["_id"] for d in docs]
+        self.terms = []                       # term id -> term
+        self.postings = []                    # term id -> {doc_pos: weight}
+        self.by_trigram = defaultdict(list)   # trigram -> [term id]
+        term_ids = {}
+
+        for doc_pos, doc in enumerate(docs):
+            for field, weight in fields.items():
+                for word in _words(doc.get(field)):
+                    term_id = term_ids.get(word)
+                    if term_id is None:
+                        term_id = term_ids[word] = len(self.terms)
+                        self.terms.append(word)
+                        self.postings.append({})
+                        for gram in _trigrams(word):
+                            self.by_trigram[gram].append(term_id)
+                    postings = self.postings[term_id]
+                    postings[doc_pos] = max(postings.get(doc_pos, 0), weight)
+
+    def _similar_terms(self, word):
+        """(term id, similarity) for indexed terms close to `word`."""
+        grams = _trigrams(word)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for term_id in self.by_trigram.get(gram, ()):
+                overlap[term_id] += 1
+        for term_id, shared in overlap.items():
+            similarity = shared / len(grams)
+            if similarity >= MIN_SIMILARITY:
+                if self.terms[term_id] == word:
+                    similarity += 0.5  # exact words outrank prefixes and typos
+                yield term_id, similarity
+
+    def search(self, query, limit=None):
+        """[(_id, score)] best first (all hits unless `limit`); every query word has to match."""
+        words = _words(query)
+        if not words:
+            return []
+
+        scores = None
+        for word in words:
+            word_scores = {}
+            for term_id, similarity in self._similar_terms(word):
+                for doc_pos, weight in self.postings[term_id].items():
+                    score = similarity * weight
+                    if score > word_scores.get(doc_pos, 0):
+                        word_scores[doc_pos] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {d: s + word_scores[d] for d, s in scores.items() if d in word_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.ids[doc_pos], round(score, 4)) for doc_pos, score in ranked]
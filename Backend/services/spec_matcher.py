@@ -0,0 +1,59 @@
+# Backend/services/spec_matcher.py
+#
+# Aho-Corasick automaton over a student's quiz specializations. Compiled
+# once per recommendation request, it answers "does any quiz spec occur in
+# this course's specializations?" in one pass over the course text instead
+# of one substring scan per (quiz spec, course spec) pair.
+
+from collections import deque
+
+# Joins a course's specializations into one searchable string; it never
+# occurs in a pattern, so a match can't straddle two specializations.
+SPEC_SEPARATOR = "\x00"
+
+
+class SpecMatcher:
+    def __init__(self, patterns):
+        # State 0 is the root; goto[state] maps a character to the next state
+        self._goto = [{}]
+        self._fail = [0]
+        self._accept = [False]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._accept.append(False)
+                state = nxt
+            self._accept[state] = True
+
+        # Breadth-first failure links; a state accepts if its fallback does
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._accept[nxt] = self._accept[nxt] or self._accept[self._fail[nxt]]
+                queue.append(nxt)
+
+    def search(self, text):
+        """True if any pattern occurs in `text`."""
+        goto, fail, accept = self._goto, self._fail, self._accept
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if accept[state]:
+                return True
+        return False
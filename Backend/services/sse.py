@@ -0,0 +1,37 @@
+# Backend/services/sse.py
+#
+# Server-Sent Events responses: each (event, data) pair from a generator is
+# written as `event: <name>\ndata: <json>\n\n` and flushed as it is produced,
+# so clients can render partial results while the rest is still computing.
+
+import json
+
+from flask import Response, stream_with_context
+
+SSE_MIMETYPE = "text/event-stream"
+
+
+def wants_sse(req):
+    """True for ?stream=sse or Accept: text/event-stream."""
+    if req.args.get("stream", "").lower() == "sse":
+        return True
+    return SSE_MIMETYPE in req.headers.get("Accept", "")
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+def sse_response(events):
+    """Stream an iterable of (event, data) pairs as text/event-stream."""
+
+    def generate():
+        for event, data in events:
+            yield sse_event(event, data)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=SSE_MIMETYPE,
+        # Don't let proxies (nginx) hold events back until the response ends
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,49 @@
+# Backend/services/timeline_exams.py
+#
+# One document per entrance exam in the "timeline_exams" collection (split
+# from the single "timeline" document), with canonical degree codes and
+# each event's free-text date parsed into indexed start/end datetimes.
+
+from services.date_ranges import parse_date_range
+from services.degree_taxonomy import degree_code
+
+TIMELINE_EXAMS_COLLECTION = "timeline_exams"
+# Key of the exam list in the legacy single "timeline" document
+LEGACY_EXAMS_KEY = "upcoming_entrance_exams_2026"
+
+TIMELINE_INDEXES = [
+    [("degree_codes", 1), ("order", 1)],
+    [("short_name", 1)],
+    # Overlap queries: events.end >= today AND events.start <= horizon
+    [("events.end", 1), ("events.start", 1)],
+]
+
+
+def exam_document(exam, order):
+    """Copy of an exam from the legacy array, ready to store on its own."""
+    doc = dict(exam)
+    doc["order"] = order
+    doc["degree_codes"] = list(dict.fromkeys(degree_code(sn) for sn in exam.get("short_name", [])))
+    events = []
+    for event in exam.get("events") or []:
+        event = dict(event)
+        event["start"], event["end"] = parse_date_range(event.get("date"))
+        events.append(event)
+    doc["events"] = events
+    return doc
+
+
+def serialize_exam(doc):
+    """API shape: the legacy exam fields plus ISO start/end per event."""
+    doc.pop("_id", None)
+    doc.pop("order", None)
+    for event in doc.get("events") or []:
+        for key in ("start", "end"):
+            if event.get(key) is not None:
+                event[key] = event[key].date().isoformat()
+    return doc
+
+
+def ensure_timeline_indexes(collection):
+    for keys in TIMELINE_INDEXES:
+        collection.create_index(keys)
@@ -2,11 +2,19 @@
 
 import json
 from services.connectDB import connect_db
+from services.degree_taxonomy import degree_code
+from migrate_timeline import migrate_timeline
 
 # Path to your JSON file
 JSON_FILE_PATH = r"C:\Users\LOQ\Desktop\New folder (3)\ApniDisha\web\Backend\data\time.json"
 COLLECTION_NAME = "timeline"
 
+def tag_exam_codes(exams):
+    """Store canonical degree codes next to each exam's short_name list."""
+    for exam in exams:
+        exam["degree_codes"] = list(dict.fromkeys(degree_code(sn) for sn in exam.get("short_name", [])))
+
+
 def upload_timeline_data():
     # Connect to DB
     db = connect_db()
@@ -20,6 +28,9 @@ def upload_timeline_data():
         with open(JSON_FILE_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
 
+        if isinstance(data, dict):
+            tag_exam_codes(data.get("upcoming_entrance_exams_2026", []))
+
         # Handle different JSON structures
         if isinstance(data, list):
             # If it's a list of documents → bulk insert
@@ -29,6 +40,8 @@ def upload_timeline_data():
             # If it's a single document
             result = collection.insert_one(data)
             print(f"Inserted 1 document with _id: {result.inserted_id}")
+            # Per-exam documents the /timeline routes read
+            migrate_timeline(JSON_FILE_PATH)
         else:
             print("Unsupported JSON structure. Must be object or array.")
 
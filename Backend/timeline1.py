@@ -173,6 +173,10 @@
 #     result = get_exam_timeline("CET 2025")
 #     print("\n📅 FINAL TIMELINE JSON:\n", result)
 import os
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import google.generativeai as genai
 from datetime import datetime
@@ -189,6 +193,22 @@ if not GEMINI_KEY:
 genai.configure(api_key=GEMINI_KEY)
 model = genai.GenerativeModel("gemini-2.0-flash")
 
+# --------------------------------------
+# FETCH LIMITS + CACHE
+# --------------------------------------
+TIMELINE_MAX_WORKERS = int(os.getenv("TIMELINE_MAX_WORKERS", "4"))
+# Gemini requests per minute across all workers. The default fits the free
+# tier's 15 RPM, which bounds a cold get_all_course_timelines() (~46 unique
+# exams) at about 3 minutes; only warm re-runs inside the cache TTL take
+# seconds. With a paid key raise this (and TIMELINE_MAX_WORKERS) to make a
+# cold refresh latency-bound instead of quota-bound.
+TIMELINE_RATE_PER_MINUTE = float(os.getenv("TIMELINE_RATE_PER_MINUTE", "15"))
+TIMELINE_CACHE_TTL_HOURS = float(os.getenv("TIMELINE_CACHE_TTL_HOURS", "24"))
+TIMELINE_CACHE_PATH = os.getenv(
+    "TIMELINE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "timeline_cache.json"),
+)
+
 
 # --------------------------------------
 # COURSE → EXAM MAPPING
@@ -223,6 +243,77 @@ COURSE_EXAMS = {
 }
 
 
+# Exam names that are covered by another entry's notification (same
+# conducting body, same cycle) → fetched once under the target name
+SHARED_EXAM_SOURCE = {
+    "JEE Main Paper 2A": "JEE Main",   # NTA, one information bulletin
+    "NID DAT PG": "NID DAT",           # NID, B.Des + M.Des in one admission cycle
+    "TANCET MCA": "TANCET",            # Anna University
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate_per_minute` tokens, bursts up to `capacity`."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, rate_per_minute / 4)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TimelineCache:
+    """JSON file of {"<exam>|<cycle year>": {"fetched_at", "timeline"}} with a TTL."""
+
+    def __init__(self, path=TIMELINE_CACHE_PATH, ttl_hours=TIMELINE_CACHE_TTL_HOURS):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    @staticmethod
+    def key(exam_name, cycle_year):
+        return f"{exam_name.lower()}|{cycle_year}"
+
+    def get(self, exam_name, cycle_year):
+        with self.lock:
+            entry = self.entries.get(self.key(exam_name, cycle_year))
+        if entry and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return entry["timeline"]
+        return None
+
+    def put(self, exam_name, cycle_year, timeline):
+        with self.lock:
+            self.entries[self.key(exam_name, cycle_year)] = {"fetched_at": time.time(), "timeline": timeline}
+            # Write-then-rename so a crash never leaves a half-written cache
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+rate_limiter = TokenBucket(TIMELINE_RATE_PER_MINUTE)
+timeline_cache = TimelineCache()
+
+
 # --------------------------------------
 # EXAM TIMELINE FETCHER USING GEMINI
 # --------------------------------------
@@ -274,6 +365,69 @@ Make sure <year> is the upcoming exam cycle (never past).
     return response.text
 
 
+def parse_timeline(text):
+    """The timeline as a list of event dicts, or None if the reply isn't that JSON array."""
+    text = (text or "").strip()
+    start = text.find("[")
+    end = text.rfind("]")
+    if start == -1 or end == -1:
+        return None
+    try:
+        events = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(events, list) or not events:
+        return None
+    if not all(isinstance(e, dict) and e.get("event") and e.get("date") for e in events):
+        return None
+    return events
+
+
+def get_cached_exam_timeline(exam_name):
+    """
+    get_exam_timeline behind the rate limiter and the per-cycle cache.
+    Only replies that parse as a timeline array are cached; refusals and
+    other text are returned as-is and fetched again next time.
+    """
+    cycle_year = datetime.now().year
+    cached = timeline_cache.get(exam_name, cycle_year)
+    if cached is not None:
+        print(f"💾 Cache hit: {exam_name} ({cycle_year})")
+        return cached
+
+    rate_limiter.acquire()
+    print(f"📘 Getting NEXT exam cycle for: {exam_name}")
+    timeline_json = get_exam_timeline(exam_name)
+    if parse_timeline(timeline_json) is None:
+        print(f"⚠️ Not a timeline, not cached: {exam_name}")
+        return timeline_json
+    timeline_cache.put(exam_name, cycle_year, timeline_json)
+    print(f"✅ Done: {exam_name}")
+    return timeline_json
+
+
+def fetch_exam_timelines(exam_names):
+    """
+    {exam: timeline} for all `exam_names`, fetched concurrently. Exams
+    sharing a source (SHARED_EXAM_SOURCE) and repeats are fetched once;
+    a failed exam maps to an error string and is not cached.
+    """
+    sources = {exam: SHARED_EXAM_SOURCE.get(exam, exam) for exam in exam_names}
+    unique_sources = list(dict.fromkeys(sources.values()))
+
+    def fetch(source):
+        try:
+            return get_cached_exam_timeline(source)
+        except Exception as e:
+            print(f"❌ Failed: {source}: {e}")
+            return f"❌ Failed to fetch timeline: {e}"
+
+    with ThreadPoolExecutor(max_workers=TIMELINE_MAX_WORKERS) as pool:
+        results = dict(zip(unique_sources, pool.map(fetch, unique_sources)))
+
+    return {exam: results[source] for exam, source in sources.items()}
+
+
 # --------------------------------------
 # COURSE TIMELINE FETCHER
 # --------------------------------------
@@ -283,18 +437,18 @@ def get_course_timeline(course_name):
     if key not in COURSE_EXAMS:
         return f"❌ Course not found: {course_name}"
 
-    exams = COURSE_EXAMS[key]
-    final_output = {}
-
     print(f"\n🔍 Fetching real-time timeline for COURSE: {course_name.upper()}\n")
+    return fetch_exam_timelines(COURSE_EXAMS[key])
 
-    for exam in exams:
-        print(f"📘 Getting NEXT exam cycle for: {exam}")
-        timeline_json = get_exam_timeline(exam)
-        final_output[exam] = timeline_json
-        print(f"✅ Done: {exam}\n")
 
-    return final_output
+def get_all_course_timelines():
+    """{course: {exam: timeline}} for every course; each exam is fetched once."""
+    all_exams = [exam for exams in COURSE_EXAMS.values() for exam in exams]
+    timelines = fetch_exam_timelines(all_exams)
+    return {
+        course: {exam: timelines[exam] for exam in exams}
+        for course, exams in COURSE_EXAMS.items()
+    }
 
 
 # --------------------------------------
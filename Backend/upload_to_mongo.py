@@ -1,8 +1,12 @@
 # upload_to_mongodb.py
 
 import json
+import sys
 from pathlib import Path
+from pymongo import UpdateOne
 from services.connectDB import connect_db 
+from services.college_fields import materialize_sort_fields, ensure_college_indexes
+from services.degree_taxonomy import tag_course_codes
 
 # ================= CONFIG =================
 JSON_FILE_PATH = r"C:\Users\LOQ\Desktop\New folder (3)\ApniDisha\web\Backend\data\cleaned_colleges_final_v31.json"
@@ -46,6 +50,11 @@ def upload_to_mongodb():
             skipped += 1
             continue
 
+        # Store the numeric directory sort fields alongside the raw values
+        college.update(materialize_sort_fields(college))
+        # Canonical degree code on every course (courses[].degree_code)
+        tag_course_codes(college.get("courses"))
+
         # This will update if exists, insert if not
         result = collection.replace_one(
             {"aishe_code": aishe_code},   # filter: find by aishe_code
@@ -64,6 +73,8 @@ def upload_to_mongodb():
         if (updated + inserted + skipped) % 50 == 0:
             print(f"Processed {updated + inserted + skipped} colleges...")
 
+    ensure_college_indexes(collection)
+
     # Final summary
     print("\nUpload Complete!")
     print(f"Inserted: {inserted}")
@@ -71,5 +82,34 @@ def upload_to_mongodb():
     print(f"Skipped (no aishe_code): {skipped}")
     print(f"Total in collection now: {collection.count_documents({})}")
 
+def backfill_sort_fields():
+    """Materialize the directory sort fields and course degree codes on colleges already in Mongo."""
+    db = connect_db()
+    if db is None:
+        print("Cannot proceed without DB connection")
+        return
+
+    collection = db[COLLECTION_NAME]
+
+    # $inc needs a number; older documents carry interest: null
+    collection.update_many({"interest": None}, {"$set": {"interest": 0}})
+
+    ops = []
+    for doc in collection.find():
+        fields = materialize_sort_fields(doc)
+        if isinstance(doc.get("courses"), list):
+            fields["courses"] = tag_course_codes(doc["courses"])
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    ensure_college_indexes(collection)
+
+    print(f"Backfilled sort fields on {len(ops)} colleges")
+
+
 if __name__ == "__main__":
-    upload_to_mongodb()
\ No newline at end of file
+    # python upload_to_mongo.py --backfill  → only recompute stored sort fields
+    if "--backfill" in sys.argv:
+        backfill_sort_fields()
+    else:
+        upload_to_mongodb()
\ No newline at end of file